@@ -0,0 +1,68 @@
+import argparse
+import resource
+import sys
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from opencv_doc_parser import parser
+
+# Measures how much memory the extracted records of a full cv2 build take with
+# the __slots__ records, compared with the same records laid out in __dict__
+# backed objects as they used to be.
+
+# Mirrors a record tree with __dict__ backed objects, sharing the leaf values
+def dictBacked(parser, value):
+    if isinstance(value, parser.Record):
+        return SimpleNamespace(**{name: dictBacked(parser, getattr(value, name)) for name in value.__slots__})
+    if isinstance(value, list):
+        return [dictBacked(parser, item) for item in value]
+    if isinstance(value, dict):
+        return {key: dictBacked(parser, item) for key, item in value.items()}
+    return value
+
+def countRecords(parser, value) -> int:
+    if isinstance(value, parser.Record):
+        return 1 + sum(countRecords(parser, getattr(value, name)) for name in value.__slots__)
+    if isinstance(value, list):
+        return sum(countRecords(parser, item) for item in value)
+    if isinstance(value, dict):
+        return sum(countRecords(parser, item) for item in value.values())
+    return 0
+
+# Bytes taken by the records and their lists and dicts, without the leaf values
+# (strings, enums) that both layouts share
+def structureSize(parser, value) -> int:
+    if isinstance(value, SimpleNamespace):
+        return sys.getsizeof(value) + sys.getsizeof(vars(value)) + sum(structureSize(parser, item) for item in vars(value).values())
+    if isinstance(value, parser.Record):
+        return sys.getsizeof(value) + sum(structureSize(parser, getattr(value, name)) for name in value.__slots__)
+    if isinstance(value, list):
+        return sys.getsizeof(value) + sum(structureSize(parser, item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(structureSize(parser, item) for item in value.values())
+    return 0
+
+if __name__ == "__main__":
+    argParser = argparse.ArgumentParser(description="Measure the memory taken by the extracted cv2 records.")
+    argParser.add_argument("modules", nargs="*", default=["cv2.aruco", "cv2.barcode", "cv2.cuda", "cv2.dnn", "cv2"])
+    args = argParser.parse_args()
+
+    parser.logLevel = 0
+    # Resolve names and stubs up front, so that only the records are measured
+    for moduleName in args.modules:
+        parser.objectNamed(moduleName)
+        parser.stubIndex.indexModule(moduleName)
+
+    tracemalloc.start()
+    model = [parser.extractModule(moduleName, moduleName != "cv2") for moduleName in args.modules]
+    extractionSize = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    mirror = dictBacked(parser, model)
+
+    print(f"records:                  {countRecords(parser, model)}")
+    print(f"__dict__ record objects:  {structureSize(parser, mirror) / 2**20:8.2f} MiB")
+    print(f"__slots__ record objects: {structureSize(parser, model) / 2**20:8.2f} MiB")
+    print(f"records with strings:     {extractionSize / 2**20:8.2f} MiB")
+    print(f"peak RSS:                 {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10:8.2f} MiB")
@@ -0,0 +1,80 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import synthetic_cv2
+
+# Repeatable docs build benchmark against a synthetic cv2, so it runs without
+# OpenCV installed. Every run is a fresh process building into an empty
+# directory with profiling on. Compare against a saved result with --baseline
+# to fail CI on performance regressions.
+
+SCRIPT = Path(__file__).parent.parent / "docstring-parsing.py"
+
+def runBuild(packageDir: Path, workDir: Path, run: int, extraArgs: list[str]) -> dict:
+    outputDir = workDir / f"output-{run}"
+    outputDir.mkdir()
+    profilePath = workDir / f"profile-{run}.json"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(packageDir), *filter(None, [os.environ.get("PYTHONPATH")])]))
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(SCRIPT), "--output-dir", str(outputDir), "--profile", str(profilePath), *extraArgs],
+                   env=env, check=True, stdout=subprocess.DEVNULL)
+    seconds = time.perf_counter() - start
+    with open(profilePath) as file:
+        profile = json.load(file)
+    return {"seconds": seconds, "profile": profile}
+
+if __name__ == "__main__":
+    argParser = argparse.ArgumentParser(description="Benchmark the docs build against a synthetic cv2.")
+    argParser.add_argument("--repeat", type=int, default=5)
+    argParser.add_argument("--functions", type=int, default=2000)
+    argParser.add_argument("--classes", type=int, default=300)
+    argParser.add_argument("--methods", type=int, default=8)
+    argParser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    argParser.add_argument("--baseline", type=Path, help="JSON results of an earlier run to compare against")
+    argParser.add_argument("--tolerance", type=float, default=0.2,
+                           help="fail if the fastest build is this much slower than the baseline's (0.2 = 20%%)")
+    argParser.add_argument("build_args", nargs=argparse.REMAINDER,
+                           help="extra arguments for docstring-parsing.py, after --")
+    args = argParser.parse_args()
+    buildArgs = [arg for arg in args.build_args if arg != "--"]
+
+    with tempfile.TemporaryDirectory() as workDir:
+        workDir = Path(workDir)
+        packageDir = workDir / "package"
+        synthetic_cv2.generate(packageDir, args.functions, args.classes, args.methods)
+        runs = [runBuild(packageDir, workDir, run, buildArgs) for run in range(args.repeat)]
+
+    times = [run["seconds"] for run in runs]
+    stages = {stage: min(run["profile"]["stages"][stage] for run in runs) for stage in runs[0]["profile"]["stages"]}
+    results = {
+        "config": {"functions": args.functions, "classes": args.classes, "methods": args.methods, "buildArgs": buildArgs},
+        "min": min(times),
+        "median": statistics.median(times),
+        "runs": times,
+        "profiled": min(run["profile"]["total"] for run in runs),
+        "stages": stages,
+        "slowest": runs[0]["profile"]["slowest"],
+    }
+    print(f"fastest {results['min']:.3f} s, median {results['median']:.3f} s over {args.repeat} runs")
+    print(f"{'profiled':>12} {results['profiled'] * 1000:10.2f} ms")
+    for stage, seconds in stages.items():
+        print(f"{stage:>12} {seconds * 1000:10.2f} ms")
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=1)
+    if args.baseline is not None:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline["config"] != results["config"]:
+            sys.exit(f"{args.baseline} was measured with {baseline['config']}, not {results['config']}")
+        ratio = results["min"] / baseline["min"]
+        print(f"{ratio:.2f}x the baseline's fastest build")
+        if ratio > 1 + args.tolerance:
+            sys.exit(f"Regression: {results['min']:.3f} s against {baseline['min']:.3f} s")
@@ -0,0 +1,54 @@
+import argparse
+import filecmp
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import synthetic_cv2
+
+# Checks that parallel builds write the same pages as a serial build under every
+# start method of the worker processes. Spawned workers import the parser
+# afresh, so any setting that isn't handed to them shows up as a difference.
+
+ROOT = Path(__file__).parent.parent
+
+# Runs the CLI with the given start method, in a fresh process
+def build(packageDir: Path, outputDir: Path, startMethod: str, buildArgs: list[str]):
+    outputDir.mkdir()
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(packageDir), str(ROOT), *filter(None, [os.environ.get("PYTHONPATH")])]))
+    code = (f"import multiprocessing; multiprocessing.set_start_method({startMethod!r}); "
+            f"from opencv_doc_parser.cli import main; main({['--output-dir', str(outputDir), *buildArgs]!r})")
+    subprocess.run([sys.executable, "-c", code], env=env, check=True, stdout=subprocess.DEVNULL)
+
+def differingFiles(left: Path, right: Path) -> list[str]:
+    comparison = filecmp.dircmp(left, right)
+    return sorted([*comparison.left_only, *comparison.right_only, *comparison.diff_files, *comparison.funny_files])
+
+if __name__ == "__main__":
+    argParser = argparse.ArgumentParser(description="Check that parallel builds match serial ones under every start method.")
+    argParser.add_argument("--jobs", type=int, default=3)
+    argParser.add_argument("--functions", type=int, default=200)
+    argParser.add_argument("--classes", type=int, default=30)
+    argParser.add_argument("build_args", nargs=argparse.REMAINDER,
+                           help="extra arguments for the builds, after -- (default: --link-types)")
+    args = argParser.parse_args()
+    buildArgs = [arg for arg in args.build_args if arg != "--"] or ["--link-types"]
+
+    failed = False
+    with tempfile.TemporaryDirectory() as workDir:
+        workDir = Path(workDir)
+        packageDir = workDir / "package"
+        synthetic_cv2.generate(packageDir, args.functions, args.classes)
+        serialDir = workDir / "serial"
+        build(packageDir, serialDir, multiprocessing.get_start_method(), ["-j", "1", *buildArgs])
+        for startMethod in multiprocessing.get_all_start_methods():
+            parallelDir = workDir / startMethod
+            build(packageDir, parallelDir, startMethod, ["-j", str(args.jobs), *buildArgs])
+            differing = differingFiles(serialDir, parallelDir)
+            print(f"{startMethod:>12}: {'differs in ' + ', '.join(differing) if differing else 'same as -j 1'}")
+            failed = failed or bool(differing)
+    if failed:
+        sys.exit("Parallel builds don't match the serial build")
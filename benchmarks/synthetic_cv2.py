@@ -0,0 +1,129 @@
+import argparse
+import random
+from pathlib import Path
+
+# Generates a stand-in cv2 package: Python modules whose functions and methods
+# carry OpenCV style docstrings, with matching .pyi stubs. Put the directory on
+# PYTHONPATH to build docs against it without OpenCV installed.
+
+SUBMODULES = ["aruco", "barcode", "cuda", "dnn"]
+WORDS = ("array image matrix input output point vector size type depth channel mask kernel border "
+         "scale value threshold contour filter pixel region camera").split()
+ARGUMENT_TYPES = ["int", "float", "bool", "str", "cv2.typing.MatLike", "cv2.typing.Point", "cv2.typing.Size",
+                  "_typing.Sequence[cv2.typing.MatLike]"]
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def identifier(rng: random.Random, prefix: str, index: int) -> str:
+    return f"{prefix}{rng.choice(WORDS).capitalize()}{rng.choice(WORDS).capitalize()}{index}"
+
+# One docstring signature and its ".   " lines, plus the arguments of the overload
+def overloadDocstring(rng: random.Random, name: str, arguments: list[str], overloaded: bool) -> str:
+    required = arguments[:len(arguments) // 2 + 1]
+    optional = arguments[len(required):]
+    signature = f"{name}({', '.join(required)}"
+    signature += "".join(f"[, {argument}" for argument in optional) + "]" * len(optional)
+    lines = [f"{signature}) -> retval"]
+    lines.append(".   @overload" if overloaded else f".   @brief {sentence(rng, 8)}")
+    lines.append(".   ")
+    for _ in range(rng.randint(2, 12)):
+        lines.append(f".   {sentence(rng, rng.randint(6, 16))}")
+    if rng.random() < 0.3:
+        lines.append(".   The result is \\f$\\sum_{i} x_i \\cdot y_i\\f$ and")
+        lines.append(".   \\f[\\texttt{dst} (I) = \\texttt{src} (I) \\cdot \\texttt{alpha}\\f]")
+    if rng.random() < 0.1:
+        lines += [".   @code{.py}", ".   result = cv2.something(image)", ".   @endcode"]
+    lines.append(".   ")
+    for argument in arguments:
+        tag = rng.choice(["@param", "@param", "@param[in]", "@param[out]"])
+        lines.append(f".   {tag} {argument} {sentence(rng, rng.randint(4, 12))}")
+    if rng.random() < 0.2:
+        lines.append(f".   @note {sentence(rng, 10)}")
+    if rng.random() < 0.2:
+        lines.append(f".   @sa {identifier(rng, 'see', rng.randint(0, 99))}")
+    return "\n".join(lines)
+
+# Returns the docstring and the stub definitions of a function or method
+def generateFunction(rng: random.Random, name: str, method: bool) -> tuple[str, list[str]]:
+    overloads = []
+    for _ in range(rng.choice([1, 1, 1, 2, 3])):
+        arguments = [f"{rng.choice(WORDS)}{i}" for i in range(rng.randint(1, 6))]
+        overloads.append((arguments, [rng.choice(ARGUMENT_TYPES) for _ in arguments]))
+    docstring = "\n\n\n\n".join(overloadDocstring(rng, name, arguments, i > 0) for i, (arguments, _) in enumerate(overloads))
+    indent = "    " if method else ""
+    selfArgument = ["self"] if method else []
+    stubs = []
+    for arguments, types in overloads:
+        # One definition for cv2.typing.MatLike and one for UMat, as in OpenCV's stubs
+        for matType in ["cv2.typing.MatLike", "UMat"]:
+            parameters = [f"{argument}: {argumentType.replace('cv2.typing.MatLike', matType)}"
+                          for argument, argumentType in zip(arguments, types)]
+            stubs.append(f"{indent}@_typing.overload\n{indent}def {name}({', '.join(selfArgument + parameters)}) -> {matType}: ...")
+    return docstring, stubs
+
+def generateModule(rng: random.Random, moduleName: str, functions: int, classes: int, methods: int, constants: int,
+                   submodules: list[str]) -> tuple[str, str]:
+    source = ["# Generated by benchmarks/synthetic_cv2.py", f'"""Synthetic stand-in for {moduleName}."""']
+    stub = ["import cv2.typing", "import typing as _typing", ""]
+    for submodule in submodules:
+        source.append(f"from . import {submodule}")
+        stub.append(f"from {moduleName} import {submodule} as {submodule}")
+    if moduleName == "cv2":
+        source.append('__version__ = "0.0.0-synthetic"')
+    source += ["", "def _function(name, doc):", "    def function(*args, **kwargs):", "        raise NotImplementedError",
+               "    function.__name__ = name", "    function.__doc__ = doc", "    return function", ""]
+    stub.append("")
+    for i in range(constants):
+        name = f"{rng.choice(WORDS).upper()}_{rng.choice(WORDS).upper()}_{i}"
+        source.append(f"{name} = {i}")
+        stub.append(f"{name}: int")
+    stub.append("")
+    for i in range(classes):
+        className = identifier(rng, "", i)
+        members = []
+        stub.append(f"class {className}:")
+        for j in range(methods):
+            methodName = identifier(rng, "get", j)
+            docstring, definitions = generateFunction(rng, methodName, method=True)
+            members.append(f"{methodName!r}: _function({methodName!r}, {docstring!r})")
+            stub += definitions
+        stub.append("    def __init__(self) -> None: ...")
+        stub.append("")
+        source.append(f"{className} = type({className!r}, (), {{{', '.join(members)}}})")
+    for i in range(functions):
+        functionName = identifier(rng, "compute", i)
+        docstring, definitions = generateFunction(rng, functionName, method=False)
+        source.append(f"{functionName} = _function({functionName!r}, {docstring!r})")
+        stub += definitions
+    source += ["", "del _function", ""]
+    stub.append("")
+    return "\n".join(source), "\n".join(stub)
+
+def generate(directory: Path, functions: int = 2000, classes: int = 300, methods: int = 8, constants: int = 200,
+             seed: int = 0):
+    rng = random.Random(seed)
+    package = directory / "cv2"
+    # The top-level module is much bigger than its submodules, as in OpenCV
+    for moduleName in ["cv2", *(f"cv2.{submodule}" for submodule in SUBMODULES)]:
+        scale = 1 if moduleName == "cv2" else 0.1
+        moduleDir = directory.joinpath(*moduleName.split("."))
+        moduleDir.mkdir(parents=True, exist_ok=True)
+        source, stub = generateModule(rng, moduleName, int(functions * scale), int(classes * scale), methods,
+                                      int(constants * scale), SUBMODULES if moduleName == "cv2" else [])
+        (moduleDir / "__init__.py").write_text(source)
+        (moduleDir / "__init__.pyi").write_text(stub)
+    (package / "typing").mkdir(exist_ok=True)
+    (package / "typing" / "__init__.py").write_text("MatLike = Point = Size = object\n")
+    (package / "py.typed").write_text("")
+
+if __name__ == "__main__":
+    argParser = argparse.ArgumentParser(description="Generate a synthetic cv2 package with stubs.")
+    argParser.add_argument("directory", type=Path)
+    argParser.add_argument("--functions", type=int, default=2000)
+    argParser.add_argument("--classes", type=int, default=300)
+    argParser.add_argument("--methods", type=int, default=8)
+    argParser.add_argument("--constants", type=int, default=200)
+    argParser.add_argument("--seed", type=int, default=0)
+    args = argParser.parse_args()
+    generate(args.directory, args.functions, args.classes, args.methods, args.constants, args.seed)
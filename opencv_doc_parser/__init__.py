@@ -0,0 +1,8 @@
+# Importing this package is cheap: cv2 and typeshed_client are only imported
+# once something is documented.
+from .parser import (
+    FunctionData, ClassData, AttributeData, ModuleData,
+    extractFunction, extractFunctions, extractClass, extractAttribute, extractModule,
+    documentNamed, documentFunctionNamed, documentClassNamed, documentAttributeNamed, documentModule,
+    buildModules, ModelCache, ApiDatabase,
+)
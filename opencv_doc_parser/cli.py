@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+def makeArgParser() -> argparse.ArgumentParser:
+    argParser = argparse.ArgumentParser(prog="opencv_doc_parser", description="Generate MyST documentation for the cv2 module.")
+    argParser.add_argument("modules", nargs="*",
+                           help="modules to document (default: cv2 and every submodule of it that has a stub)")
+    argParser.add_argument("--object", action="append", default=[], metavar="NAME",
+                           help="print the documentation of a single module, class, function or attribute instead of building; repeatable")
+    argParser.add_argument("--diff", nargs=2, type=Path, metavar=("OLD", "NEW"),
+                           help="print the API changes between two models saved with --database or --cache-dir instead of building")
+    argParser.add_argument("--diff-json", type=Path, metavar="PATH",
+                           help="also write the API changes found by --diff to this JSON file")
+    argParser.add_argument("--attributes", choices=["submodules", "all", "none"], default="submodules",
+                           help="modules whose attributes are documented (default: all but cv2 itself)")
+    argParser.add_argument("--link-types", action="store_true",
+                           help="qualify the names in types with the module they come from, so Sphinx links them to their documentation")
+    argParser.add_argument("--shard", action="store_true",
+                           help="give every class its own page and split functions over several pages, so Sphinx can build them in parallel")
+    argParser.add_argument("-j", "--jobs", type=int, default=1,
+                           help="number of worker processes (0 = one per CPU)")
+    argParser.add_argument("-i", "--incremental", action="store_true",
+                           help="only re-render objects whose docstring or stub changed since the last build")
+    argParser.add_argument("--cache-dir", type=Path,
+                           help="save the extracted records in this directory, and reuse them while cv2 and its stubs are unchanged")
+    argParser.add_argument("--render-only", action="store_true",
+                           help="render from the newest cached records matching the stubs, or else from --database, without importing cv2")
+    argParser.add_argument("--database", type=Path,
+                           help="also save the extracted API to this SQLite database, for looking up functions by parameter type, deprecated APIs, etc.")
+    argParser.add_argument("--batch-size", type=int, default=0, metavar="N",
+                           help="extract and render the members of each module N at a time, and release each module's stubs once it is written, to bound memory")
+    argParser.add_argument("--memory-limit", type=float, metavar="MIB",
+                           help="with --batch-size and -j, only extract the next batch while the current one is rendered if memory use is below this")
+    argParser.add_argument("-o", "--output-dir", type=Path, default=Path(__file__).parent.parent.parent / "opencv-python-docs" / "source",
+                           help="directory to write the generated files to")
+    argParser.add_argument("--watch", action="store_true",
+                           help="keep running, and rebuild the objects whose stubs changed whenever a stub file is saved; builds serially")
+    argParser.add_argument("--poll-interval", type=float, default=0.5,
+                           help="seconds between checks for changed stubs in watch mode")
+    argParser.add_argument("--profile", type=Path,
+                           help="write the time taken by every build stage per module and object to this JSON file")
+    argParser.add_argument("--slowest", type=int, default=10,
+                           help="number of slowest objects to list in the profile")
+    return argParser
+
+def attributeModulesOf(modules: list[str], attributes: str) -> set[str]:
+    if attributes == "all":
+        return set(modules)
+    if attributes == "none":
+        return set()
+    return {moduleName for moduleName in modules if moduleName != "cv2"}
+
+def writeIndexes(parser, outputDir: Path, modules: list[str], shard: bool, inventory):
+    print("Making index.md...")
+    parser.writeIfChanged(outputDir / "index.md", parser.makeIndexMD(modules, shard))
+    print("Making objects.inv and searchindex.json...")
+    inventory.write(outputDir)
+
+# Rebuilds whenever stub files change. cv2, the stubs of unchanged modules, the
+# parsed docstrings and the last build's records all stay in memory, so only
+# objects whose stub nodes changed are extracted and rendered again. Docstrings
+# come from the compiled cv2, so changing them still needs a restart. The
+# manifest of -i is read at the start but not written on every change. Builds
+# are serial, since a change only re-extracts the few objects whose stubs
+# changed: new workers would import cv2 and parse the stubs again on every
+# change, and workers kept for the session would go on using the old stubs.
+def watch(parser, args, modules: list[str], attributeModules: set[str]):
+    # The per-object progress would be repeated for every object on every change
+    parser.logLevel = 0
+    watcher = parser.StubWatcher("cv2")
+    build = parser.IncrementalBuild(args.output_dir / parser.MANIFEST_NAME)
+    try:
+        while True:
+            start = time.perf_counter()
+            inventory = parser.Inventory()
+            try:
+                parser.buildModules(modules, args.output_dir, attributeModules=attributeModules,
+                                    shard=args.shard, inventory=inventory, build=build)
+                writeIndexes(parser, args.output_dir, modules, args.shard, inventory)
+                print(f"Built in {time.perf_counter() - start:.2f} s: {build}")
+            except (SyntaxError, OSError) as error:
+                # Usually a stub read while it was being saved; the save is another change
+                print(f"Build failed: {error}")
+            build.restart()
+            print("Watching the stubs for changes...")
+            changedModules = watcher.wait(args.poll_interval)
+            print(f"Stubs changed: {', '.join(sorted(changedModules))}")
+            parser.stubIndex.invalidate(changedModules)
+            build.invalidate(changedModules)
+    except KeyboardInterrupt:
+        pass
+
+def main(argv: list[str] = None):
+    argParser = makeArgParser()
+    args = argParser.parse_args(argv)
+    if args.render_only and args.cache_dir is None and args.database is None:
+        argParser.error("--render-only requires --cache-dir or --database")
+    if args.diff_json is not None and not args.diff:
+        argParser.error("--diff-json requires --diff")
+    if args.memory_limit is not None and not args.batch_size:
+        argParser.error("--memory-limit requires --batch-size")
+    if args.memory_limit is not None and args.jobs == 1:
+        argParser.error("--memory-limit requires -j, as serial builds never extract ahead")
+    if args.watch and (args.cache_dir or args.profile or args.database):
+        argParser.error("--watch can't be combined with --cache-dir, --database or --profile")
+    if args.watch and args.jobs != 1:
+        argParser.error("--watch builds serially, so can't be combined with -j")
+
+    # Imported after parsing, so that --help and argument errors are instant
+    from . import parser
+
+    parser.typeRenderer.links = args.link_types
+    if args.diff:
+        oldPath, newPath = args.diff
+        diff = parser.diffModels(parser.loadSnapshot(oldPath), parser.loadSnapshot(newPath))
+        print("".join(parser.emitChangelog(diff, oldPath.name, newPath.name)), end="")
+        if args.diff_json is not None:
+            with open(args.diff_json, "w") as file:
+                json.dump(diff, file, indent=1)
+        return
+
+    if args.object:
+        # Keep stdout to the documentation itself
+        parser.logLevel = 0
+        for name in args.object:
+            print(parser.documentNamed(name, name in attributeModulesOf([name], args.attributes)))
+        return
+
+    outputDir = args.output_dir
+    parser.profiler.enabled = args.profile is not None
+    parser.profiler.enabledAt = time.perf_counter()
+    if args.modules:
+        modules = args.modules
+    elif args.render_only:
+        # Left to the cached or saved model, so that cv2 isn't imported
+        modules = None
+    else:
+        modules = parser.moduleGraph.discover("cv2")
+    attributeModules = attributeModulesOf(modules, args.attributes) if modules is not None else None
+    if args.watch:
+        watch(parser, args, modules, attributeModules)
+        return
+    inventory = parser.Inventory()
+    modules = parser.buildModules(modules, outputDir, jobs=args.jobs or os.cpu_count(), incremental=args.incremental,
+                                  cache=parser.ModelCache(args.cache_dir) if args.cache_dir else None, renderOnly=args.render_only,
+                                  attributeModules=attributeModules, shard=args.shard, inventory=inventory,
+                                  database=parser.ApiDatabase(args.database) if args.database else None, batchSize=args.batch_size,
+                                  memoryLimit=int(args.memory_limit * 2**20) if args.memory_limit is not None else None)
+
+    writeIndexes(parser, outputDir, modules, args.shard, inventory)
+
+    if parser.logLevel >= parser.LL_DEBUG_OVER: print(parser.objectTable)
+    if parser.logLevel >= parser.LL_DEBUG_OVER: print(parser.stubIndex)
+    if parser.logLevel >= parser.LL_DEBUG_OVER: print(parser.docstringCache)
+    if parser.logLevel >= parser.LL_DEBUG_OVER: print(parser.typeRenderer)
+    if parser.logLevel >= parser.LL_DEBUG_OVER: print(inventory)
+    if parser.profiler.enabled:
+        report = parser.profiler.report(modules, args.slowest)
+        report["docstrings"] = parser.docstringCache.stats()
+        report["types"] = parser.typeRenderer.stats()
+        report["peakRss"] = parser.peakRss()
+        with open(args.profile, "w") as file:
+            json.dump(report, file, indent=1)
+        print("Slowest objects:")
+        for entry in report["slowest"]:
+            print(f"{entry['seconds'] * 1000:10.2f} ms  {entry['name']}")
+    peak = parser.peakRss()
+    if peak is not None:
+        print(f"Peak memory: {peak / 2**20:.1f} MiB{'' if args.jobs == 1 else ' (not counting the workers)'}")
+    print("Done.")
@@ -0,0 +1,2148 @@
+from enum import Enum
+import inspect
+from typing import Callable, Iterable, Iterator
+import ast
+import re
+from pathlib import Path
+import functools
+from functools import partial
+from collections import deque
+import os
+import hashlib
+import filecmp
+import json
+import zlib
+import importlib
+import pickle
+import sys
+import time
+import contextlib
+import copy
+
+LL_DEBUG_OVER = 1
+LL_DEBUG_SPECIFIC = 2
+logLevel = LL_DEBUG_SPECIFIC
+
+# Members handed to a worker process at a time in parallel builds
+PARALLEL_CHUNK_SIZE = 16
+# Functions per page of a sharded module
+SHARD_FUNCTIONS = 50
+# Written next to the generated files by incremental builds
+MANIFEST_NAME = ".opencv-doc-parser-manifest.pickle"
+# Part of the key of cached models. Bump it whenever the extraction or the
+# layout of the records changes, so that models extracted before are not reused.
+MODEL_VERSION = 2
+
+# Base of the parsed API records. Many thousands of them are alive at once for
+# the full cv2 namespace, so they use __slots__ instead of a __dict__.
+class Record:
+    __slots__ = ()
+
+    def __repr__(self):
+        return str({name: getattr(self, name) for name in self.__slots__})
+
+class ParamData(Record):
+    __slots__ = ("name", "brief", "type")
+
+    def __init__(self):
+        self.name: str = ""
+        self.brief: str = ""
+        self.type: str = ""
+
+class NoteData(Record):
+    __slots__ = ("type", "note")
+
+    def __init__(self):
+        self.type: str = ""
+        self.note: str = ""
+
+class FunctionType(Enum):
+    UNKNOWN = 0
+    FUNCTION = 1
+    INSTANCE_METHOD = 2
+    CLASS_METHOD = 3
+    STATIC_METHOD = 4
+
+class FunctionData(Record):
+    __slots__ = ("function", "name", "unqualifiedName", "brief", "docstringSignature", "astSignature", "params",
+                 "notes", "description", "returnDescription", "returnType", "type", "overloads")
+
+    def __init__(self):
+        self.function: Callable = None
+        self.name: str = ""
+        self.unqualifiedName: str = ""
+        self.brief: str = ""
+        self.docstringSignature: str = ""
+        self.astSignature: str = ""
+        self.params: dict[str, ParamData] = dict()
+        self.notes: list[NoteData] = []
+        self.description: str = ""
+        self.returnDescription: str = ""
+        self.returnType: str = "object"
+        self.type: FunctionType = FunctionType.UNKNOWN
+        # Every signature after the first one, each with its own docs and types
+        self.overloads: list[FunctionData] = []
+
+    @property
+    def signatures(self) -> list["FunctionData"]:
+        return [self, *self.overloads]
+
+class AttributeData(Record):
+    __slots__ = ("name", "unqualifiedName", "brief", "type", "value")
+
+    def __init__(self):
+        self.name: str = ""
+        self.unqualifiedName: str = ""
+        self.brief: str = ""
+        self.type: str = ""
+        self.value: str = None
+
+class ClassData(Record):
+    __slots__ = ("theClass", "name", "unqualifiedName", "brief", "docstringSignature", "description", "notes",
+                 "classMethods", "staticMethods", "instanceMethods", "instanceAttributes")
+
+    def __init__(self):
+        self.theClass: object = None
+        self.name: str = ""
+        self.unqualifiedName: str = ""
+        self.brief: str = ""
+        self.docstringSignature: str = ""
+        self.description: str = ""
+        self.notes: list[NoteData] = []
+        self.classMethods: list[FunctionData] = []
+        self.staticMethods: list[FunctionData] = []
+        self.instanceMethods: list[FunctionData] = []
+        self.instanceAttributes: list[AttributeData] = []
+
+class ModuleData(Record):
+    __slots__ = ("name", "doc", "attributes", "classes", "functions")
+
+    def __init__(self):
+        self.name: str = ""
+        self.doc: str = None
+        # None when the module's attributes aren't documented
+        self.attributes: list[AttributeData] = None
+        self.classes: list[ClassData] = []
+        self.functions: list[FunctionData] = []
+
+# Records how long each stage of the build takes for every module and object.
+# Time spent in a nested stage is only counted for that stage, e.g. the stub
+# lookups made while extracting a class are not also counted as extraction.
+# Only stages run in this process are recorded; profile serial builds.
+class Profiler:
+    STAGES = ["import", "getmembers", "extract", "docstring", "stubs", "render", "write"]
+
+    def __init__(self):
+        self.enabled: bool = False
+        self.enabledAt: float = 0.0
+        self.timings: dict[tuple[str, str], float] = dict()
+        # [stage, name, start] of every stage that is currently running
+        self.running: list[list] = []
+
+    def stage(self, stage: str, name: str):
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return ProfilerStage(self, stage, name)
+
+    def start(self, stage: str, name: str):
+        now = time.perf_counter()
+        if self.running:
+            self.record(now)
+        self.running.append([stage, name, now])
+
+    def stop(self):
+        self.record(time.perf_counter())
+        self.running.pop()
+        if self.running:
+            self.running[-1][2] = time.perf_counter()
+
+    def record(self, now: float):
+        stage, name, start = self.running[-1]
+        self.timings[stage, name] = self.timings.get((stage, name), 0.0) + now - start
+
+    # Objects are attributed to the longest of the modules that prefixes them.
+    # Names outside every module, e.g. index files, only count towards the stages.
+    def report(self, modules: list[str], slowest: int = 10) -> dict:
+        stages = {stage: 0.0 for stage in self.STAGES}
+        byModule = {moduleName: {stage: 0.0 for stage in self.STAGES} for moduleName in modules}
+        byObject: dict[str, dict[str, float]] = dict()
+        for (stage, name), seconds in self.timings.items():
+            stages[stage] += seconds
+            moduleName = max((moduleName for moduleName in modules if name == moduleName or name.startswith(moduleName + ".")),
+                             key=len, default=None)
+            if moduleName is not None:
+                byModule[moduleName][stage] += seconds
+            if moduleName is not None and name not in modules:
+                byObject.setdefault(name, dict())[stage] = seconds
+        slowestObjects = sorted(byObject.items(), key=lambda item: sum(item[1].values()), reverse=True)[:slowest]
+        return {
+            # Wall time since profiling was enabled, including time outside every stage
+            "total": time.perf_counter() - self.enabledAt,
+            "stages": stages,
+            "modules": byModule,
+            "slowest": [{"name": name, "seconds": sum(timings.values()), "stages": timings} for name, timings in slowestObjects],
+        }
+
+class ProfilerStage:
+    def __init__(self, profiler: Profiler, stage: str, name: str):
+        self.profiler = profiler
+        self.stage = stage
+        self.name = name
+
+    def __enter__(self):
+        self.profiler.start(self.stage, self.name)
+
+    def __exit__(self, *exc):
+        self.profiler.stop()
+
+profiler = Profiler()
+
+# Maps dotted names to objects. A module's members are all added the first time
+# the module is reached, so resolving names is mostly a dict hit. Root modules
+# like cv2 are only imported once something actually needs them, so that
+# rendering from a cached model never loads them.
+class ObjectTable:
+    def __init__(self):
+        self.objects: dict[str, object] = dict()
+        self.walkedModules: set[str] = set()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def walkModule(self, moduleName: str, module):
+        self.walkedModules.add(moduleName)
+        for name, value in vars(module).items():
+            self.objects.setdefault(moduleName + "." + name, value)
+
+    def resolve(self, name: str) -> object:
+        if name in self.objects:
+            self.hits += 1
+            return self.objects[name]
+        self.misses += 1
+        path, *parts = name.split(".")
+        if path not in self.objects:
+            with profiler.stage("import", path):
+                self.objects[path] = importlib.import_module(path)
+        obj = self.objects[path]
+        for part in parts:
+            if inspect.ismodule(obj) and path not in self.walkedModules:
+                self.walkModule(path, obj)
+            path += "." + part
+            if path not in self.objects:
+                self.objects[path] = getattr(obj, part)
+            obj = self.objects[path]
+        if inspect.ismodule(obj) and path not in self.walkedModules:
+            self.walkModule(path, obj)
+        return obj
+
+    def __repr__(self):
+        return f"ObjectTable({len(self.objects)} names, {self.hits} hits, {self.misses} misses)"
+
+objectTable = ObjectTable()
+
+def objectNamed(name: str) -> object:
+    return objectTable.resolve(name)
+
+class Reference:
+    def setValue(self, value): pass
+    def getValue(self): pass
+
+class AttributeReference:
+    target: object
+    attrname: tuple | str
+    def __init__(self, target, attrname):
+        self.target = target
+        self.attrname = attrname
+    def getValue(self):
+        return getattr(self.target, self.attrname)
+    def setValue(self, value):
+        setattr(self.target, self.attrname, value)
+
+class IndexReference:
+    target: object
+    index: object
+    def __init__(self, target, index):
+        self.target = target
+        self.index = index
+    def getValue(self):
+        return self.target[self.index]
+    def setValue(self, value):
+        self.target[self.index] = value
+
+class TokenType(Enum):
+    TEXT = 0
+    BLANK = 1
+    BRIEF = 2
+    PARAM = 3
+    PARAM_IN = 4
+    PARAM_OUT = 5
+    RETURN = 6
+    NOTE = 7
+    SEE_ALSO = 8
+    DEPRECATED = 9
+    CODE = 10
+    CODE_LANG = 11
+    ENDCODE = 12
+    THROWS = 13
+    WARNING = 14
+    OVERLOAD = 15
+
+# Line prefixes recognised as Doxygen tags; the rest of the line is the token text
+DOCSTRING_TAGS: dict[str, TokenType] = {
+    "@brief ": TokenType.BRIEF,
+    "@param ": TokenType.PARAM,
+    "@param[in]": TokenType.PARAM_IN,
+    "@param[out]": TokenType.PARAM_OUT,
+    "@return ": TokenType.RETURN,
+    "@returns ": TokenType.RETURN,
+    "@note ": TokenType.NOTE,
+    "@sa ": TokenType.SEE_ALSO,
+    "@see ": TokenType.SEE_ALSO,
+    "@deprecated ": TokenType.DEPRECATED,
+    "@code{.": TokenType.CODE_LANG,
+    "@code": TokenType.CODE,
+    "@endcode": TokenType.ENDCODE,
+    "@throws ": TokenType.THROWS,
+    "@exception ": TokenType.THROWS,
+    "@warning ": TokenType.WARNING,
+    "@overload": TokenType.OVERLOAD,
+    "\\overload": TokenType.OVERLOAD,
+}
+
+# Longest first, so that e.g. "@code{." wins over "@code"
+DOCSTRING_TAG_PATTERN = "|".join(map(re.escape, sorted(DOCSTRING_TAGS, key=len, reverse=True)))
+
+# Splits a whole docstring into (TokenType, text) tokens with one regex scan.
+# linePattern matches a single line, with {tags} standing in for the tag
+# alternation and named groups "tag" and "rest"; lines that don't match it
+# produce no token. mathMarkers maps Doxygen math delimiters to MyST ones.
+class DocstringLexer:
+    def __init__(self, linePattern: str, mathMarkers: dict[str, str]):
+        self.lineRegex = re.compile(linePattern.format(tags=DOCSTRING_TAG_PATTERN), re.MULTILINE)
+        self.mathRegex = re.compile("|".join(map(re.escape, mathMarkers)))
+        self.mathMarkers = mathMarkers
+
+    def substituteMath(self, text: str) -> str:
+        return self.mathRegex.sub(lambda match: self.mathMarkers[match.group()], text)
+
+    # The token of a line matched by the line pattern
+    @staticmethod
+    def tokenOf(match: re.Match) -> tuple[TokenType, str]:
+        tag, rest = match.group("tag", "rest")
+        if tag is not None:
+            return DOCSTRING_TAGS[tag], rest
+        elif rest == "":
+            return TokenType.BLANK, rest
+        else:
+            return TokenType.TEXT, rest
+
+    def tokenize(self, text: str) -> Iterator[tuple[TokenType, str]]:
+        for match in self.lineRegex.finditer(self.substituteMath(text)):
+            yield self.tokenOf(match)
+
+# Function docstrings only document lines with the ".   " continuation prefix
+functionDocstringLexer = DocstringLexer(r"^\.   (?P<tag>{tags})?(?P<rest>.*)$", {
+    "\\f$": "$",
+    "\\f[": "\\begin{equation*}",
+    "\\f]": "\\end{equation*}",
+})
+classDocstringLexer = DocstringLexer(r"^[ .*]*[^\S\n]*(?P<tag>{tags})?(?P<rest>.*?)[^\S\n]*$", {
+    "\\f$": "$",
+    "\\f[": "$",
+    "\\f]": "$",
+})
+
+def descriptionReference(data: FunctionData, curData: Reference) -> Reference:
+    if curData is None:
+        curData = AttributeReference(data, "description")
+        data.description += "\n"
+    return curData
+
+def parseBriefToken(data, text: str, curData: Reference) -> Reference:
+    data.brief = text
+    return AttributeReference(data, "brief")
+
+def paramTokenParser(prefix: str) -> Callable:
+    def parseParamToken(data: FunctionData, text: str, curData: Reference) -> Reference:
+        splitline = text.split()
+        paramName = splitline[0]
+        if paramName not in data.params:
+            data.params[paramName] = ParamData()
+        param = data.params[paramName]
+        param.name = paramName
+        param.brief = prefix + " ".join(splitline[1:])
+        return AttributeReference(param, "brief")
+    return parseParamToken
+
+def parseReturnToken(data: FunctionData, text: str, curData: Reference) -> Reference:
+    data.returnDescription = text
+    return AttributeReference(data, "returnDescription")
+
+def noteTokenParser(noteType: str) -> Callable:
+    def parseNoteToken(data, text: str, curData: Reference) -> Reference:
+        note = NoteData()
+        note.type = noteType
+        note.note = text
+        data.notes.append(note)
+        return AttributeReference(note, "note")
+    return parseNoteToken
+
+# Lines following @overload still belong to the description
+def parseOverloadToken(data: FunctionData, text: str, curData: Reference) -> Reference:
+    noteTokenParser("overload")(data, text, curData)
+    return None
+
+def parseCodeToken(data: FunctionData, text: str, curData: Reference) -> Reference:
+    curData = descriptionReference(data, curData)
+    curData.setValue(curData.getValue() + "\n```c++\n")
+    return curData
+
+def parseCodeLangToken(data: FunctionData, text: str, curData: Reference) -> Reference:
+    curData = descriptionReference(data, curData)
+    curData.setValue(curData.getValue() + f"\n```{text.removesuffix('}')}\n")
+    return curData
+
+def parseEndcodeToken(data: FunctionData, text: str, curData: Reference) -> Reference:
+    curData = descriptionReference(data, curData)
+    curData.setValue(curData.getValue() + "```\n")
+    return curData
+
+def parseBlankToken(data: FunctionData, text: str, curData: Reference) -> Reference:
+    return None
+
+def parseTextToken(data: FunctionData, text: str, curData: Reference) -> Reference:
+    curData = descriptionReference(data, curData)
+    curData.setValue(curData.getValue() + text + "\n")
+    return curData
+
+FUNCTION_TOKEN_PARSERS: dict[TokenType, Callable] = {
+    TokenType.TEXT: parseTextToken,
+    TokenType.BLANK: parseBlankToken,
+    TokenType.BRIEF: parseBriefToken,
+    TokenType.PARAM: paramTokenParser(""),
+    TokenType.PARAM_IN: paramTokenParser("[in] "),
+    TokenType.PARAM_OUT: paramTokenParser("[out] "),
+    TokenType.RETURN: parseReturnToken,
+    TokenType.NOTE: noteTokenParser("note"),
+    TokenType.SEE_ALSO: noteTokenParser("sa"),
+    TokenType.DEPRECATED: noteTokenParser("deprecated"),
+    TokenType.CODE: parseCodeToken,
+    TokenType.CODE_LANG: parseCodeLangToken,
+    TokenType.ENDCODE: parseEndcodeToken,
+    TokenType.THROWS: noteTokenParser("throws"),
+    TokenType.WARNING: noteTokenParser("warning"),
+    TokenType.OVERLOAD: parseOverloadToken,
+}
+
+# Classes only take their brief and notes from the docstring
+CLASS_TOKEN_PARSERS: dict[TokenType, Callable] = {
+    tokenType: FUNCTION_TOKEN_PARSERS[tokenType] for tokenType in [
+        TokenType.BRIEF, TokenType.NOTE, TokenType.SEE_ALSO, TokenType.DEPRECATED,
+        TokenType.THROWS, TokenType.WARNING,
+    ]
+}
+
+def parseDocstringTokens(tokens: Iterable[tuple[TokenType, str]], data: FunctionData | ClassData, parsers: dict[TokenType, Callable]):
+    curData: Reference = None
+    for tokenType, text in tokens:
+        parser = parsers.get(tokenType)
+        if parser is not None:
+            curData = parser(data, text, curData)
+
+def parseDocstringOfClass(theClass: Callable, data: ClassData):
+    if not theClass.__doc__:
+        return
+    data.docstringSignature, _, body = theClass.__doc__.partition("\n")
+    parseDocstringTokens(classDocstringLexer.tokenize(body), data, CLASS_TOKEN_PARSERS)
+
+# Matches docstring signatures like "norm(src1, src2[, normType[, mask]]) -> retval"
+SIGNATURE_REGEX = re.compile(r"^(?P<name>[A-Za-z_]\w*)\((?P<args>.*)\)(?: -> (?P<returns>.*))?$", re.MULTILINE)
+
+def overloadOf(data: FunctionData) -> FunctionData:
+    overload = FunctionData()
+    overload.function = data.function
+    overload.name = data.name
+    overload.unqualifiedName = data.unqualifiedName
+    overload.type = data.type
+    return overload
+
+def parseDocstringOfFunction(function: Callable, data: FunctionData):
+    if not function.__doc__:
+        return
+    docstringCache.parseInto(function.__doc__, data)
+
+# Overloaded functions have one signature line per overload, each followed by
+# the ".   " lines documenting that overload
+def parseFunctionDocstring(docstring: str, data: FunctionData):
+    signature, _, body = docstring.partition("\n")
+    if "Initialize self.  See help(type(self)) for accurate signature." not in signature:
+        data.docstringSignature = signature
+    signatureMatch = SIGNATURE_REGEX.match(signature)
+    overloadMatches = []
+    if signatureMatch is not None:
+        overloadMatches = [match for match in SIGNATURE_REGEX.finditer(body)
+                           if match.group("name") == signatureMatch.group("name")]
+    blockEnd = overloadMatches[0].start() if overloadMatches else len(body)
+    parseDocstringTokens(functionDocstringLexer.tokenize(body[:blockEnd]), data, FUNCTION_TOKEN_PARSERS)
+    for i, match in enumerate(overloadMatches):
+        overload = overloadOf(data)
+        overload.docstringSignature = match.group()
+        blockEnd = overloadMatches[i + 1].start() if i + 1 < len(overloadMatches) else len(body)
+        parseDocstringTokens(functionDocstringLexer.tokenize(body[match.end():blockEnd]), overload, FUNCTION_TOKEN_PARSERS)
+        data.overloads.append(overload)
+
+# Scans many function docstrings joined into one, with a line holding only this
+# between them, for their ends, overload signatures and ".   " lines at once.
+# Consecutive lines of plain text are matched together, as a single token.
+DOCSTRING_SEPARATOR = "\0"
+FUNCTION_DOCSTRINGS_REGEX = re.compile("|".join([
+    f"^{DOCSTRING_SEPARATOR}$",
+    SIGNATURE_REGEX.pattern,
+    r"^\.   (?!{tags})(?P<text>.+(?:\n\.   (?!{tags}).+)*)$".format(tags=DOCSTRING_TAG_PATTERN),
+    functionDocstringLexer.lineRegex.pattern,
+]), re.MULTILINE)
+
+# Parses many function docstrings with a single scan of all of them, giving the
+# same records as parseFunctionDocstring on each, without its overhead per
+# docstring. The tokens of each signature are parsed as its end is reached.
+def parseFunctionDocstrings(docstrings: list[str]) -> list[FunctionData]:
+    records: list[FunctionData] = []
+    names: list[str] = []
+    bodies: list[str] = []
+    for docstring in docstrings:
+        data = FunctionData()
+        signature, _, body = docstring.partition("\n")
+        if "Initialize self.  See help(type(self)) for accurate signature." not in signature:
+            data.docstringSignature = signature
+        signatureMatch = SIGNATURE_REGEX.match(signature)
+        names.append(signatureMatch.group("name") if signatureMatch is not None else None)
+        bodies.append(body)
+        records.append(data)
+    text = functionDocstringLexer.substituteMath(f"\n{DOCSTRING_SEPARATOR}\n".join(bodies))
+    index = 0
+    data = current = records[0] if records else None
+    tokens: list[tuple[TokenType, str]] = []
+    for match in FUNCTION_DOCSTRINGS_REGEX.finditer(text):
+        matched = match.lastgroup
+        if matched == "text":
+            tokens.append((TokenType.TEXT, match.group("text").replace("\n.   ", "\n")))
+            continue
+        if matched == "rest":
+            tokens.append(DocstringLexer.tokenOf(match))
+            continue
+        name = match.group("name")
+        if name is not None and name != names[index]:
+            continue
+        parseDocstringTokens(tokens, current, FUNCTION_TOKEN_PARSERS)
+        tokens = []
+        if name is not None:
+            current = overloadOf(data)
+            current.docstringSignature = match.group()
+            data.overloads.append(current)
+        else:
+            index += 1
+            data = current = records[index]
+    if records:
+        parseDocstringTokens(tokens, current, FUNCTION_TOKEN_PARSERS)
+    return records
+
+# Copies what the docstring says about a signature. Params are copied because
+# the stubs add their types later; notes are never changed, so they're shared.
+def copyDocstringFields(source: FunctionData, data: FunctionData):
+    data.docstringSignature = source.docstringSignature
+    data.brief = source.brief
+    data.description = source.description
+    data.returnDescription = source.returnDescription
+    data.notes = list(source.notes)
+    for paramName, sourceParam in source.params.items():
+        param = ParamData()
+        param.name = sourceParam.name
+        param.brief = sourceParam.brief
+        data.params[paramName] = param
+
+# Parsed function docstrings keyed on their text. Many docstrings are identical,
+# e.g. inherited cv2.Algorithm methods, cv2.cuda mirrors of CPU functions and
+# *_create factories; each of them is only tokenized and parsed once.
+class DocstringCache:
+    def __init__(self):
+        self.parsed: dict[str, FunctionData] = dict()
+        self.hits: int = 0
+        self.misses: int = 0
+        # Characters of docstrings that were reused instead of parsed again
+        self.savedChars: int = 0
+        # Docstrings parsed ahead by parseAll that haven't been used yet
+        self.primed: set[str] = set()
+
+    def parseInto(self, docstring: str, data: FunctionData):
+        parsed = self.parsed.get(docstring)
+        if parsed is None:
+            self.misses += 1
+            parsed = FunctionData()
+            parseFunctionDocstring(docstring, parsed)
+            self.parsed[docstring] = parsed
+        elif docstring in self.primed:
+            self.primed.discard(docstring)
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.savedChars += len(docstring)
+        copyDocstringFields(parsed, data)
+        for parsedOverload in parsed.overloads:
+            overload = overloadOf(data)
+            copyDocstringFields(parsedOverload, overload)
+            data.overloads.append(overload)
+
+    # Parses the docstrings that aren't parsed yet all at once, see
+    # parseFunctionDocstrings
+    def parseAll(self, docstrings: Iterable[str]):
+        # One containing the separator is parsed on its own when it is used
+        pending = [docstring for docstring in dict.fromkeys(docstrings)
+                   if docstring and docstring not in self.parsed and DOCSTRING_SEPARATOR not in docstring]
+        self.parsed.update(zip(pending, parseFunctionDocstrings(pending)))
+        self.primed.update(pending)
+
+    def clear(self):
+        self.parsed.clear()
+        self.primed.clear()
+
+    def stats(self) -> dict:
+        return {"unique": self.misses, "reused": self.hits, "savedChars": self.savedChars}
+
+    def __repr__(self):
+        return f"DocstringCache({self.misses} parsed, {self.hits} reused, {self.savedChars} characters not parsed again)"
+
+docstringCache = DocstringCache()
+
+# The extract* functions build the records for a name. Records hold no cv2
+# objects, so they can be sent between processes and cached on disk.
+def extractFunction(name) -> FunctionData:
+    with profiler.stage("extract", name):
+        function = objectNamed(name)
+        data = FunctionData()
+        data.name = name
+        data.unqualifiedName = name.rpartition(".")[2]
+        data.type = FunctionType.FUNCTION
+        with profiler.stage("docstring", name):
+            parseDocstringOfFunction(function, data)
+        with profiler.stage("stubs", name):
+            parseAstOfFunction(name, data)
+    return data
+
+# The records of many functions, with their docstrings parsed together. Their
+# parsing is profiled under their modules, usually just one.
+def extractFunctions(names: list[str]) -> list[FunctionData]:
+    with profiler.stage("docstring", ", ".join(dict.fromkeys(name.rpartition(".")[0] for name in names))):
+        docstringCache.parseAll(objectNamed(name).__doc__ for name in names)
+    return [extractFunction(name) for name in names]
+
+def extractClass(name) -> ClassData:
+    with profiler.stage("extract", name):
+        data = ClassData()
+        data.name = name
+        data.theClass = objectNamed(name)
+        with profiler.stage("docstring", name):
+            parseDocstringOfClass(data.theClass, data)
+        with profiler.stage("stubs", name):
+            parseAstOfClass(name, data)
+        data.theClass = None
+    return data
+
+def extractAttribute(name: str) -> AttributeData:
+    with profiler.stage("extract", name):
+        attrdata = AttributeData()
+        attrdata.name = name
+        with profiler.stage("stubs", name):
+            parseAstOfAttribute(name, attrdata)
+    return attrdata
+
+def documentFunctionNamed(name) -> str:
+    # print(f"Documenting {name}...")
+    data = extractFunction(name)
+    return documentFunction(data.function, data)
+
+# The emit* functions are generators of output fragments, so that output can be
+# streamed to a file. The document* functions join them into a single string.
+def emitNotes(notes: list[NoteData]) -> Iterator[str]:
+    for note in notes:
+        if note.type == "note":
+            yield f"\n```{{note}}\n{note.note}\n```"
+        elif note.type == "sa":
+            yield f"\n**See also:** {note.note}"
+        elif note.type == "deprecated":
+            yield f"\n```{{deprecated}} unknown\n{note.note}\n```"
+            # yield f"\n**Deprecated:** {note.note}"
+        elif note.type == "throws":
+            yield f"\n**Throws:** {note.note}"
+        elif note.type == "warning":
+            yield f"\n```{{warning}}\n{note.note}\n```"
+        elif note.type == "overload":
+            yield "\n```{note}\nThis is an overloaded function, provided for convenience. It differs from the above function only in what argument(s) it accepts.\n```"
+
+def emitFunction(function: Callable, data: FunctionData) -> Iterator[str]:
+    yield from emitSignature(function, data)
+    for overload in data.overloads:
+        yield "\n\n"
+        yield from emitSignature(function, overload, noindex=True)
+
+def emitSignature(function: Callable, data: FunctionData, noindex: bool = False) -> Iterator[str]:
+    if data.type == FunctionType.FUNCTION:
+        yield "````{py:function} "
+    else:
+        yield "````{py:method} "
+    if data.docstringSignature:
+        yield data.docstringSignature
+    else:
+        # yield data.unqualifiedName + str(inspect.signature(function))
+        yield data.astSignature
+    yield "\n"
+    if noindex:
+        # Only the first signature is an index and cross-reference target
+        yield ":noindex:\n"
+    if data.type == FunctionType.FUNCTION or data.type == FunctionType.INSTANCE_METHOD:
+        yield "\n"
+    elif data.type == FunctionType.CLASS_METHOD:
+        yield ":classmethod:\n"
+    elif data.type == FunctionType.STATIC_METHOD:
+        yield ":staticmethod:\n"
+    yield data.brief
+    yield "\n\n"
+    yield data.description
+    yield from emitNotes(data.notes)
+    yield "\n\n"
+    for param in data.params.values():
+        # yield f"\n:param {param.type} {param.name}: {param.brief}"
+        yield f"\n:param {param.name}: {param.brief}\n:type {param.name}: {param.type}"
+    if data.returnDescription != "":
+        yield f"\n:return: {data.returnDescription}"
+    if data.returnType != "":
+        yield f"\n:rtype: {data.returnType}"
+    yield "\n````"
+
+def documentFunction(function: Callable, data: FunctionData) -> str:
+    return "".join(emitFunction(function, data))
+
+def emitClass(data: ClassData) -> Iterator[str]:
+    yield f"`````{{py:class}} {data.unqualifiedName}\n"
+    yield data.brief
+    yield "\n\n"
+    yield data.description
+    yield from emitNotes(data.notes)
+    yield "\n\n"
+    for funcdata in [*data.classMethods, *data.instanceMethods, *data.staticMethods]:
+        yield from emitFunction(funcdata.function, funcdata)
+        yield "\n\n"
+    for attrdata in data.instanceAttributes:
+        yield documentAttribute(attrdata) + "\n\n"
+    yield "\n`````"
+
+def documentClass(data: ClassData) -> str:
+    return "".join(emitClass(data))
+
+def documentClassNamed(name) -> str:
+    return documentClass(extractClass(name))
+
+def documentAttributeNamed(name: str) -> str:
+    return documentAttribute(extractAttribute(name))
+
+def documentAttribute(attrdata: AttributeData) -> str:
+    retval = f"```{{py:attribute}} {attrdata.unqualifiedName}\n"
+    if attrdata.type: retval += f":type: {attrdata.type}\n"
+    if attrdata.value: retval += f":value: {attrdata.value}\n"
+    retval += "```"
+    return retval
+
+
+
+# Classifies the members of each module once, as "module", "class", "function"
+# or "attribute", and finds a package's documented submodules breadth first.
+class ModuleGraph:
+    def __init__(self):
+        self.members: dict[str, dict[str, list[str]]] = dict()
+
+    def membersOf(self, moduleName: str) -> dict[str, list[str]]:
+        members = self.members.get(moduleName)
+        if members is not None:
+            return members
+        members = {"module": [], "class": [], "function": [], "attribute": []}
+        module = objectNamed(moduleName)
+        with profiler.stage("getmembers", moduleName):
+            for name, value in inspect.getmembers(module):
+                if inspect.ismodule(value):
+                    kind = "module"
+                elif inspect.isclass(value):
+                    kind = "class"
+                elif callable(value):
+                    kind = "function"
+                else:
+                    kind = "attribute"
+                members[kind].append(moduleName + "." + name)
+        self.members[moduleName] = members
+        return members
+
+    # Submodules are only walked once under their own __name__, however many
+    # modules they're reachable from, and only documented if they have a stub.
+    # Modules from other packages (os, numpy...) are left alone.
+    def discover(self, packageName: str) -> list[str]:
+        visited = {packageName}
+        queue = deque([packageName])
+        while queue:
+            for name in self.membersOf(queue.popleft())["module"]:
+                submodule = objectNamed(name)
+                submoduleName = submodule.__name__
+                if submoduleName in visited or not submoduleName.startswith(packageName + "."):
+                    continue
+                visited.add(submoduleName)
+                objectTable.objects.setdefault(submoduleName, submodule)
+                if stubIndex.hasModule(submoduleName):
+                    queue.append(submoduleName)
+                elif logLevel >= LL_DEBUG_OVER: print(f"Skipping {submoduleName}, which has no stub")
+        # Submodules first, like the module list this replaces
+        return sorted(self.members.keys() - {packageName}) + [packageName]
+
+moduleGraph = ModuleGraph()
+
+def functionsInModule(moduleName) -> list[str]:
+    return moduleGraph.membersOf(moduleName)["function"]
+
+def classesInModule(moduleName) -> list[str]:
+    return moduleGraph.membersOf(moduleName)["class"]
+
+def attributesInModule(moduleName) -> list[str]:
+    return moduleGraph.membersOf(moduleName)["attribute"]
+
+# The docstrings of a module's functions and of the methods its classes define
+def docstringsInModule(moduleName) -> list[str]:
+    docstrings = [objectNamed(name).__doc__ for name in functionsInModule(moduleName)]
+    for className in classesInModule(moduleName):
+        docstrings.extend(member.__doc__ for member in vars(objectNamed(className)).values() if inspect.isroutine(member))
+    return docstrings
+
+def emitSection(title: str, texts: Iterable[str]) -> Iterator[str]:
+    yield f"## {title}\n"
+    for text in texts:
+        yield text
+        yield "\n\n\n"
+
+def documentSection(title: str, texts: Iterable[str]) -> str:
+    return "".join(emitSection(title, texts))
+
+# A mapper has the signature of the builtin map. Passing a process pool's map
+# instead renders the members of a section in parallel, in the same order.
+def documentFunctionsInModule(moduleName, mapper: Callable = map) -> str:
+    names = functionsInModule(moduleName)
+    if logLevel >= LL_DEBUG_OVER:
+        for name in names: print(f"Documenting function {name}...")
+    return documentSection("Functions", mapper(documentFunctionNamed, names))
+
+def documentClassesInModule(moduleName, mapper: Callable = map) -> str:
+    names = classesInModule(moduleName)
+    if logLevel >= LL_DEBUG_OVER:
+        for name in names: print(f"Documenting class {name}...")
+    return documentSection("Classes", mapper(documentClassNamed, names))
+
+def documentAttributesInModule(moduleName, mapper: Callable = map) -> str:
+    names = attributesInModule(moduleName)
+    if logLevel >= LL_DEBUG_OVER:
+        for name in names: print(f"Documenting attribute {name}...")
+    return documentSection("Attributes", mapper(documentAttributeNamed, names))
+
+# Each section of a module page: title, kind of member, the function extracting
+# a member's record, the function rendering it, and the member names
+def memberSections(moduleName, documentAttributes: bool = False) -> list[tuple[str, str, Callable, Callable, list[str]]]:
+    sections = []
+    if documentAttributes:
+        sections.append(("Attributes", "attribute", extractAttribute, documentAttribute, attributesInModule(moduleName)))
+    sections.append(("Classes", "class", extractClass, documentClass, classesInModule(moduleName)))
+    sections.append(("Functions", "function", extractFunction, lambda data: documentFunction(data.function, data), functionsInModule(moduleName)))
+    return sections
+
+def extractModule(moduleName, documentAttributes: bool = False, mapper: Callable = map) -> ModuleData:
+    moduleData = ModuleData()
+    moduleData.name = moduleName
+    moduleData.doc = objectNamed(moduleName).__doc__
+    with profiler.stage("docstring", moduleName):
+        docstringCache.parseAll(docstringsInModule(moduleName))
+    for title, kind, extract, render, names in memberSections(moduleName, documentAttributes):
+        setattr(moduleData, title.lower(), list(mapper(extract, names)))
+    return moduleData
+
+def renderRecord(render: Callable, record: Record) -> str:
+    with profiler.stage("render", record.name):
+        return render(record)
+
+def renderedItems(records: Iterable, render: Callable) -> Iterator[tuple[object, str]]:
+    for record in records:
+        yield record, renderRecord(render, record)
+
+def collectedItems(items: Iterable[tuple[object, str]], records: list = None) -> Iterator[tuple[object, str]]:
+    for record, text in items:
+        if records is not None:
+            records.append(record)
+        yield record, text
+
+# Records are extracted through the mapper and rendered here. Each section is a
+# title and the (record, text) of its members. When moduleData is given, the
+# extracted records are also collected into it as they are rendered.
+def moduleSections(moduleName, documentAttributes: bool = False, mapper: Callable = map,
+                   build: "IncrementalBuild" = None, moduleData: ModuleData = None) -> list[tuple[str, Iterable[tuple[Record, str]]]]:
+    sections = []
+    for title, kind, extract, render, names in memberSections(moduleName, documentAttributes):
+        if logLevel >= LL_DEBUG_OVER:
+            print(f"Documenting {title.lower()} in {moduleName}...")
+            for name in names: print(f"Documenting {kind} {name}...")
+        if build is not None:
+            items = build.map(extract, render, names)
+        else:
+            items = renderedItems(mapper(extract, names), render)
+        records = None
+        if moduleData is not None:
+            records = []
+            setattr(moduleData, title.lower(), records)
+        sections.append((title, collectedItems(items, records)))
+    return sections
+
+def modelSections(moduleData: ModuleData) -> list[tuple[str, Iterable[tuple[Record, str]]]]:
+    sections = []
+    if moduleData.attributes is not None:
+        sections.append(("Attributes", renderedItems(moduleData.attributes, documentAttribute)))
+    sections.append(("Classes", renderedItems(moduleData.classes, documentClass)))
+    sections.append(("Functions", renderedItems(moduleData.functions, lambda data: documentFunction(data.function, data))))
+    return sections
+
+def emitModuleHeader(moduleName, doc: str) -> Iterator[str]:
+    yield f"# `{moduleName}`\n"
+    yield f"```{{py:module}} {moduleName}\n{doc}\n```\n"
+
+def emitModule(moduleName, doc: str, sections: list[tuple[str, Iterable[tuple[Record, str]]]]) -> Iterator[str]:
+    yield from emitModuleHeader(moduleName, doc)
+    for title, items in sections:
+        yield from emitSection(title, (text for record, text in items))
+        yield "\n"
+
+# Splits a section of a sharded module into (page name, title, items) pages:
+# one per class, and functions SHARD_FUNCTIONS to a page
+def shardsOf(title: str, items: Iterable[tuple[Record, str]]) -> Iterator[tuple[str, str, list[tuple[Record, str]]]]:
+    if title == "Classes":
+        for record, text in items:
+            yield record.name.rpartition(".")[2], f"`{record.name}`", [(record, text)]
+        return
+    pages = 0
+    page: list[tuple[Record, str]] = []
+    for item in items:
+        page.append(item)
+        if len(page) == SHARD_FUNCTIONS:
+            pages += 1
+            yield numberedPage(title, pages, page)
+            page = []
+    if page:
+        yield numberedPage(title, pages + 1, page)
+
+def numberedPage(title: str, number: int, page: list[tuple[Record, str]]) -> tuple[str, str, list[tuple[Record, str]]]:
+    first, last = (record.name.rpartition(".")[2] for record in (page[0][0], page[-1][0]))
+    return f"{title.lower()}-{number}", f"{title} `{first}` to `{last}`", page
+
+def emitShardPage(moduleName, title: str, texts: list[str]) -> Iterator[str]:
+    yield f"# {title}\n"
+    yield f"```{{py:currentmodule}} {moduleName}\n```\n"
+    for text in texts:
+        yield text
+        yield "\n\n\n"
+
+# Sharded modules keep their attributes on the module page, but their classes
+# and functions go on pages of their own in a directory named after the
+# module, linked from toctrees on the module page. Sphinx can then read the
+# pages in parallel instead of one huge page on a single thread. Pages left
+# over from earlier builds are removed.
+def emitShardedModule(outputDir: Path, moduleName, doc: str, sections: list[tuple[str, Iterable[tuple[Record, str]]]],
+                      inventory: "Inventory" = None) -> Iterator[str]:
+    shardDir = outputDir / moduleName
+    shardDir.mkdir(exist_ok=True)
+    pageNames: set[str] = set()
+    yield from emitModuleHeader(moduleName, doc)
+    for title, items in sections:
+        if title == "Attributes":
+            if inventory is not None:
+                items = inventory.recorded(items, f"{moduleName}.html")
+            yield from emitSection(title, (text for record, text in items))
+            yield "\n"
+            continue
+        yield f"## {title}\n"
+        yield "```{toctree}\n---\nmaxdepth: 1\n---\n"
+        for pageName, pageTitle, page in shardsOf(title, items):
+            if inventory is not None:
+                for record, text in page:
+                    inventory.addRecord(record, f"{moduleName}/{pageName}.html")
+            writeIfChanged(shardDir / f"{pageName}.md", "".join(emitShardPage(moduleName, pageTitle, [text for record, text in page])),
+                           moduleName)
+            pageNames.add(f"{pageName}.md")
+            yield f"{moduleName}/{pageName}.md\n"
+        yield "```\n\n"
+    for path in shardDir.glob("*.md"):
+        if path.name not in pageNames:
+            path.unlink()
+
+def assembleModule(moduleName, sections: list[tuple[str, Iterable[tuple[Record, str]]]]) -> str:
+    return "".join(emitModule(moduleName, objectNamed(moduleName).__doc__, sections))
+
+def documentModule(moduleName, documentAttributes: bool = False, mapper: Callable = map) -> str:
+    return assembleModule(moduleName, moduleSections(moduleName, documentAttributes, mapper))
+
+# Documents any module, class, function or attribute by its name
+def documentNamed(name: str, documentAttributes: bool = False) -> str:
+    obj = objectNamed(name)
+    if inspect.ismodule(obj):
+        return documentModule(name, documentAttributes)
+    if inspect.isclass(obj):
+        return documentClassNamed(name)
+    if callable(obj):
+        return documentFunctionNamed(name)
+    return documentAttributeNamed(name)
+
+# Maps fully-qualified names to stub AST nodes. Each stub module is parsed once
+# by the shared resolver and fully indexed the first time it is touched.
+# typeshed_client is only imported then, like cv2 in ObjectTable.
+class StubIndex:
+    def __init__(self, searchContext: "typeshed_client.SearchContext" = None):
+        self.searchContext = searchContext
+        self._resolver: "typeshed_client.Resolver" = None
+        self.nodes: dict[str, "ast.AST | typeshed_client.OverloadedName"] = dict()
+        # What the names imported by each stub refer to, e.g. cv2.cuda._typing -> typing
+        self.imports: dict[str, str] = dict()
+        self.indexedModules: set[str] = set()
+        # Hashes of the names each stub imports and defines, see namespaceHashOf
+        self.namespaceHashes: dict[str, str] = dict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @property
+    def resolver(self) -> "typeshed_client.Resolver":
+        if self._resolver is None:
+            import typeshed_client
+            self._resolver = typeshed_client.Resolver(self.searchContext)
+        return self._resolver
+
+    def indexModule(self, moduleName: str):
+        if moduleName in self.indexedModules:
+            return
+        import typeshed_client
+        self.indexedModules.add(moduleName)
+        module = self.resolver.get_module(typeshed_client.ModulePath(tuple(moduleName.split("."))))
+        for name, nameInfo in module.names.items():
+            # Re-exports resolve to ImportedInfo, which astOf never documented
+            if isinstance(nameInfo.ast, typeshed_client.ImportedName):
+                importedName = ".".join(nameInfo.ast.module_name)
+                if nameInfo.ast.name is not None:
+                    importedName += "." + nameInfo.ast.name
+                self.imports[moduleName + "." + name] = importedName
+                continue
+            self.nodes[moduleName + "." + name] = nameInfo.ast
+
+    # Forgets the stubs of moduleNames, which are parsed again when next used,
+    # and the types rendered from them. The resolver is replaced, since it keeps
+    # every module it has parsed.
+    def invalidate(self, moduleNames: Iterable[str]):
+        import typeshed_client
+        moduleNames = set(moduleNames)
+        self.indexedModules -= moduleNames
+        for moduleName in moduleNames:
+            self.namespaceHashes.pop(moduleName, None)
+        typeRenderer.invalidate(moduleNames)
+        self.nodes = {name: node for name, node in self.nodes.items() if name.rpartition(".")[0] not in moduleNames}
+        self.imports = {name: target for name, target in self.imports.items() if name.rpartition(".")[0] not in moduleNames}
+        if self._resolver is not None:
+            self._resolver = typeshed_client.Resolver(self._resolver.ctx)
+
+    def hasModule(self, moduleName: str) -> bool:
+        import typeshed_client
+        return typeshed_client.get_stub_file(moduleName, search_context=self.resolver.ctx) is not None
+
+    def lookup(self, name: str) -> "ast.AST | typeshed_client.OverloadedName":
+        self.indexModule(name.rpartition(".")[0])
+        node = self.nodes.get(name)
+        if node is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return node
+
+    # The full name of a name as used in moduleName's stub, through the names the
+    # stub defines and imports. Others, e.g. builtins, are returned as they are.
+    def qualifiedName(self, moduleName: str, name: str) -> str:
+        self.indexModule(moduleName)
+        first, dot, rest = name.partition(".")
+        target = self.imports.get(moduleName + "." + first)
+        if target is None:
+            if moduleName + "." + first not in self.nodes:
+                return name
+            target = moduleName + "." + first
+        return target + dot + rest
+
+    # Linked types are qualified through the names a stub imports and defines,
+    # so changing those changes how every type in the stub is written
+    def namespaceHashOf(self, moduleName: str) -> str:
+        namespaceHash = self.namespaceHashes.get(moduleName)
+        if namespaceHash is None:
+            self.indexModule(moduleName)
+            imports = sorted((name, target) for name, target in self.imports.items() if name.rpartition(".")[0] == moduleName)
+            names = sorted(name for name in self.nodes if name.rpartition(".")[0] == moduleName)
+            namespaceHash = self.namespaceHashes[moduleName] = hashlib.sha1(repr((imports, names)).encode()).hexdigest()
+        return namespaceHash
+
+    def __repr__(self):
+        return f"StubIndex({len(self.nodes)} names in {len(self.indexedModules)} modules, {self.hits} hits, {self.misses} misses)"
+
+stubIndex = StubIndex()
+
+# A key that is equal for equal annotations, quicker to make than unparsing.
+# Names are the common case and are keyed by themselves.
+def structureOf(node: ast.AST) -> object:
+    nodeType = type(node)
+    if nodeType is ast.Name:
+        return node.id
+    if nodeType is ast.Attribute:
+        return (".", structureOf(node.value), node.attr)
+    if nodeType is ast.Subscript:
+        return ("[]", structureOf(node.value), structureOf(node.slice))
+    if nodeType is ast.BinOp:
+        return (type(node.op).__name__, structureOf(node.left), structureOf(node.right))
+    if nodeType is ast.Tuple or nodeType is ast.List:
+        return (nodeType.__name__, *[structureOf(element) for element in node.elts])
+    if nodeType is ast.Constant:
+        # 1, 1.0 and True are equal but are unparsed differently
+        return (type(node.value).__name__, node.value)
+    return ast.dump(node)
+
+def dottedNameOf(node: ast.Attribute) -> str:
+    names = []
+    while isinstance(node, ast.Attribute):
+        names.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    names.append(node.id)
+    return ".".join(reversed(names))
+
+class QualifiedNames(ast.NodeTransformer):
+    def __init__(self, moduleName: str):
+        self.moduleName = moduleName
+
+    def visit_Name(self, node: ast.Name) -> ast.Name:
+        return ast.Name(stubIndex.qualifiedName(self.moduleName, node.id), node.ctx)
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        dottedName = dottedNameOf(node)
+        if dottedName is None:
+            return self.generic_visit(node)
+        return ast.Name(stubIndex.qualifiedName(self.moduleName, dottedName), node.ctx)
+
+# Unparses the annotations, decorators and argument lists of the stubs. A few
+# hundred distinct annotations are used tens of thousands of times, so each is
+# unparsed once. With links, the names in them are qualified with where they
+# come from, e.g. GpuMat as cv2.cuda.GpuMat and _typing.Sequence as
+# typing.Sequence, so that Sphinx's cross-references to them resolve (set
+# python_use_unqualified_type_names to show them unqualified).
+class TypeRenderer:
+    def __init__(self, links: bool = False):
+        self.links = links
+        self.rendered: dict[tuple, str] = dict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    # node as used in moduleName's stub
+    def render(self, node: ast.AST, moduleName: str) -> str:
+        key = (moduleName if self.links else None, structureOf(node))
+        text = self.rendered.get(key)
+        if text is None:
+            self.misses += 1
+            if self.links:
+                node = QualifiedNames(moduleName).visit(copy.deepcopy(node))
+            # The same few type names recur thousands of times; interning shares them
+            text = self.rendered[key] = sys.intern(ast.unparse(node))
+        else:
+            self.hits += 1
+        return text
+
+    # The argument list of a signature, as ast.unparse would write it, from the
+    # rendered annotations and defaults
+    def renderArguments(self, args: ast.arguments, moduleName: str) -> str:
+        def argument(arg: ast.arg, default: ast.AST = None) -> str:
+            text = arg.arg
+            if arg.annotation is not None:
+                text += ": " + self.render(arg.annotation, moduleName)
+            if default is not None:
+                text += "=" + self.render(default, moduleName)
+            return text
+
+        positional = [*args.posonlyargs, *args.args]
+        defaults = [None] * (len(positional) - len(args.defaults)) + args.defaults
+        texts = [argument(arg, default) for arg, default in zip(positional, defaults)]
+        if args.posonlyargs:
+            texts.insert(len(args.posonlyargs), "/")
+        if args.vararg is not None:
+            texts.append("*" + argument(args.vararg))
+        elif args.kwonlyargs:
+            texts.append("*")
+        texts.extend(argument(arg, default) for arg, default in zip(args.kwonlyargs, args.kw_defaults))
+        if args.kwarg is not None:
+            texts.append("**" + argument(args.kwarg))
+        return ", ".join(texts)
+
+    # Linked types depend on the stub they're used in, see StubIndex.namespaceHashOf
+    def invalidate(self, moduleNames: set[str]):
+        if self.links:
+            self.rendered = {key: text for key, text in self.rendered.items() if key[0] not in moduleNames}
+
+    def stats(self) -> dict:
+        return {"unique": self.misses, "reused": self.hits}
+
+    def __repr__(self):
+        return f"TypeRenderer({self.misses} unparsed, {self.hits} reused{', linked' if self.links else ''})"
+
+typeRenderer = TypeRenderer()
+
+def astOf(name) -> ast.AST:
+    import typeshed_client
+    node = stubIndex.lookup(name)
+    if isinstance(node, typeshed_client.OverloadedName):
+        return node.definitions[0]
+    return node
+
+def definitionsOf(name) -> list[ast.AST]:
+    import typeshed_client
+    node = stubIndex.lookup(name)
+    if isinstance(node, typeshed_client.OverloadedName):
+        return node.definitions
+    if node is None:
+        return []
+    return [node]
+
+def parseAstOfFunction(name: str, data: FunctionData):
+    parseOverloadAsts(definitionsOf(name), data, name.rpartition(".")[0])
+
+def argumentNames(functionAST: ast.FunctionDef) -> list[str]:
+    args = functionAST.args
+    return [arg.arg for arg in [*args.posonlyargs, *args.args, *args.kwonlyargs] if arg.arg not in ("self", "cls")]
+
+# Pairs every docstring signature with the stub definition taking the same
+# arguments. Stubs usually have more definitions than the docstring has
+# signatures, e.g. one for cv2.typing.MatLike and one for UMat.
+def parseOverloadAsts(definitions: list[ast.FunctionDef], data: FunctionData, moduleName: str):
+    if not data.docstringSignature and not data.overloads:
+        # Without docstring signatures (e.g. __init__), the stubs are all we have
+        for definition in definitions[1:]:
+            data.overloads.append(overloadOf(data))
+    unmatched = list(definitions)
+    for signature in data.signatures:
+        if not unmatched:
+            break
+        definition = unmatched[0]
+        signatureMatch = SIGNATURE_REGEX.match(signature.docstringSignature)
+        if signatureMatch is not None:
+            names = re.findall(r"[A-Za-z_]\w*", signatureMatch.group("args"))
+            definition = next((d for d in unmatched if argumentNames(d) == names), definition)
+        unmatched.remove(definition)
+        parseFunctionAst(definition, signature, moduleName)
+    for overload in data.overloads:
+        if overload.type == FunctionType.UNKNOWN:
+            overload.type = data.type
+
+# The docstring is parsed first, so the parameters are reordered to follow the
+# stub, with those only in the docstring after them
+def parseFunctionAst(functionAST: ast.FunctionDef, data: FunctionData, moduleName: str):
+    params: dict[str, ParamData] = dict()
+    for arg in functionAST.args.args:
+        paramName = arg.arg
+        param = data.params.pop(paramName, None) or ParamData()
+        params[paramName] = param
+        param.name = sys.intern(paramName)
+        if arg.annotation is not None:
+            param.type = typeRenderer.render(arg.annotation, moduleName)
+    params.update(data.params)
+    data.params = params
+    if data.type != FunctionType.FUNCTION:
+        for decorator in functionAST.decorator_list:
+            decoratorName = typeRenderer.render(decorator, moduleName)
+            if decoratorName == "staticmethod":
+                data.type = FunctionType.STATIC_METHOD
+                break
+            elif decoratorName == "classmethod":
+                data.type = FunctionType.CLASS_METHOD
+                break
+            else:
+                data.type = FunctionType.INSTANCE_METHOD
+    if functionAST.returns is not None:
+        data.returnType = typeRenderer.render(functionAST.returns, moduleName)
+    data.astSignature = data.unqualifiedName + "(" + typeRenderer.renderArguments(functionAST.args, moduleName) + ")"
+
+def parseAstOfAttribute(name: str, attrdata: AttributeData):
+    attr: ast.FunctionDef = astOf(name)
+    if attr is None:
+        return
+    parseAttributeAst(attr, attrdata, name.rpartition(".")[0])
+
+def parseAttributeAst(attr: ast.AnnAssign, attrdata: AttributeData, moduleName: str):
+    # attrdata.name = name + "." + ast.unparse(attr.target)
+    attrdata.unqualifiedName = ast.unparse(attr.target)
+    attrdata.type = typeRenderer.render(attr.annotation, moduleName)
+    if attr.value is not None:
+        attrdata.value = ast.unparse(attr.value)
+
+def parseAstOfClass(name: str, data: ClassData):
+    classAST: ast.ClassDef = astOf(name)
+    if classAST is None:
+        return
+    data.unqualifiedName = classAST.name
+    moduleName = name.rpartition(".")[0]
+    methods: dict[str, list[ast.FunctionDef]] = dict()
+    for attr in classAST.body:
+        if isinstance(attr, ast.AnnAssign):
+            attrdata = AttributeData()
+            parseAttributeAst(attr, attrdata, moduleName)
+            data.instanceAttributes.append(attrdata)
+        elif isinstance(attr, ast.FunctionDef):
+            # Overloaded methods have one definition per overload
+            methods.setdefault(attr.name, []).append(attr)
+    for methodName, definitions in methods.items():
+        funcdata = FunctionData()
+        funcdata.unqualifiedName = methodName
+        funcdata.name = name + "." + methodName
+        if data.theClass is not None:
+            with profiler.stage("docstring", name):
+                parseDocstringOfFunction(getattr(data.theClass, methodName), funcdata)
+        parseOverloadAsts(definitions, funcdata, moduleName)
+        if funcdata.type == FunctionType.INSTANCE_METHOD:
+            data.instanceMethods.append(funcdata)
+        elif funcdata.type == FunctionType.CLASS_METHOD:
+            data.classMethods.append(funcdata)
+        else:
+            data.staticMethods.append(funcdata)
+    return
+
+# Sharded modules have toctrees of their own pages, which the index shows one
+# level deep
+def makeIndexMD(modules: list[str], shard: bool = False):
+    retval = """<!-- Generated by opencv-doc-parser -->
+# OpenCV Python API
+
+```{toctree}
+---
+caption: Contents
+titlesonly: true
+"""
+    if shard:
+        retval += "maxdepth: 2\n"
+    retval += """---
+"""
+    for moduleName in modules:
+        retval += f"{moduleName}.md\n"
+    retval += "```\n"
+    return retval
+
+# print(documentFunction(cv2.aruco.calibrateCameraCharucoExtended))
+# print(documentFunction("cv2.aruco.calibrateCameraCharucoExtended"))
+# print(documentModule("cv2.aruco"))
+# print(documentClassNamed("cv2.aruco.Dictionary"))
+# print(astOfFunction("cv2.aruco.calibrateCameraCharucoExtended"))
+
+def fingerprintOf(name: str) -> str:
+    import typeshed_client
+    obj = objectNamed(name)
+    stubIndex.indexModule(name.rpartition(".")[0])
+    node = stubIndex.nodes.get(name)
+    hasher = hashlib.sha1(repr(obj.__doc__).encode())
+    if isinstance(node, typeshed_client.OverloadedName):
+        for definition in node.definitions:
+            hasher.update(ast.dump(definition).encode())
+    elif node is not None:
+        hasher.update(ast.dump(node).encode())
+    if typeRenderer.links:
+        hasher.update(stubIndex.namespaceHashOf(name.rpartition(".")[0]).encode())
+    if isinstance(node, ast.ClassDef):
+        # Methods are documented from their own docstrings as part of the class
+        for member in node.body:
+            if isinstance(member, ast.FunctionDef):
+                hasher.update(repr(getattr(getattr(obj, member.name, None), "__doc__", None)).encode())
+    return hasher.hexdigest()
+
+# Records pickled when this was still a script refer to classes in __main__,
+# which no longer exist; those pickles count as missing
+def loadPickle(path: Path) -> object:
+    with open(path, "rb") as file:
+        try:
+            return pickle.load(file)
+        except AttributeError:
+            return None
+
+# Remembers every object's record and rendered text together with a fingerprint
+# of its inputs, so that later builds only re-extract and re-render objects
+# whose docstring or stub changed. The whole manifest is discarded when this
+# module itself changes.
+class IncrementalBuild:
+    def __init__(self, manifestPath: Path, mapper: Callable = map):
+        self.manifestPath = manifestPath
+        self.mapper = mapper
+        # Linked types change the records as much as a change to this file would
+        self.rendererHash: str = hashlib.sha1(Path(__file__).read_bytes() + repr(typeRenderer.links).encode()).hexdigest()
+        self.previous: dict[str, tuple[str, object, str]] = dict()
+        self.entries: dict[str, tuple[str, object, str]] = dict()
+        # Modules with members in this build; the others keep their previous entries
+        self.modules: set[str] = set()
+        self.reused: int = 0
+        self.rendered: int = 0
+        # Fingerprints already computed in this process, see invalidate
+        self.fingerprints: dict[str, str] = dict()
+        if manifestPath.exists():
+            manifest = loadPickle(manifestPath)
+            if manifest is not None and manifest.get("renderer") == self.rendererHash:
+                self.previous = manifest["entries"]
+
+    # Yields (record, text) for every name; stale records are extracted through
+    # the wrapped mapper. Nothing is fingerprinted until the items are used, so
+    # a module's stubs are only indexed once it is written.
+    def map(self, extract: Callable, render: Callable, names: Iterable[str]) -> Iterator[tuple[object, str]]:
+        names = list(names)
+        self.modules.update(name.rpartition(".")[0] for name in names)
+        def items():
+            fingerprints = [extract.__name__ + ":" + self.fingerprintOf(name) for name in names]
+            stale = [name for name, fingerprint in zip(names, fingerprints)
+                     if self.previous.get(name, [None])[0] != fingerprint]
+            staleNames = set(stale)
+            staleRecords = iter(self.mapper(extract, stale))
+            for name, fingerprint in zip(names, fingerprints):
+                if name in staleNames:
+                    record = next(staleRecords)
+                    text = renderRecord(render, record)
+                    self.rendered += 1
+                else:
+                    _, record, text = self.previous[name]
+                    self.reused += 1
+                self.entries[name] = (fingerprint, record, text)
+                yield record, text
+        return items()
+
+    def fingerprintOf(self, name: str) -> str:
+        fingerprint = self.fingerprints.get(name)
+        if fingerprint is None:
+            fingerprint = self.fingerprints[name] = fingerprintOf(name)
+        return fingerprint
+
+    # Docstrings don't change while cv2 is imported, so fingerprints only need
+    # computing again for the members of modules whose stubs changed
+    def invalidate(self, moduleNames: Iterable[str]):
+        moduleNames = set(moduleNames)
+        self.fingerprints = {name: fingerprint for name, fingerprint in self.fingerprints.items()
+                             if name.rpartition(".")[0] not in moduleNames}
+
+    # Makes this build's entries the previous ones of the next build, e.g. in
+    # watch mode. Entries of a build that failed partway are kept as well.
+    def restart(self):
+        self.previous.update(self.entries)
+        self.entries = dict()
+        self.modules = set()
+        self.reused = 0
+        self.rendered = 0
+
+    # Builds of some modules keep the entries of the others, so that a full
+    # build after them only renders what changed
+    def save(self):
+        entries = {name: entry for name, entry in self.previous.items() if name.rpartition(".")[0] not in self.modules}
+        entries.update(self.entries)
+        with open(self.manifestPath, "wb") as file:
+            pickle.dump({"renderer": self.rendererHash, "entries": entries}, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __repr__(self):
+        return f"IncrementalBuild({self.rendered} rendered, {self.reused} reused)"
+
+def stubDirectoryOf(packageName: str) -> Path:
+    import typeshed_client
+    stubFile = typeshed_client.get_stub_file(packageName, search_context=stubIndex.resolver.ctx)
+    return stubFile.parent if stubFile is not None else None
+
+def stubHashOf(packageName: str) -> str:
+    hasher = hashlib.sha1()
+    stubDirectory = stubDirectoryOf(packageName)
+    if stubDirectory is not None:
+        for path in sorted(stubDirectory.rglob("*.pyi")):
+            hasher.update(str(path.relative_to(stubDirectory)).encode())
+            hasher.update(path.read_bytes())
+    return hasher.hexdigest()
+
+# Polls the modification times of a package's stub files. There are only a
+# few dozen, so polling is as quick as inotify, without a dependency.
+class StubWatcher:
+    def __init__(self, packageName: str):
+        self.packageName = packageName
+        self.directory = stubDirectoryOf(packageName)
+        self.mtimes = self.scan()
+
+    def scan(self) -> dict[Path, int]:
+        if self.directory is None:
+            return dict()
+        return {path: path.stat().st_mtime_ns for path in self.directory.rglob("*.pyi")}
+
+    def moduleOf(self, path: Path) -> str:
+        parts = path.relative_to(self.directory).with_suffix("").parts
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        return ".".join([self.packageName, *parts])
+
+    # Blocks until stub files are added, changed or removed, and returns their modules
+    def wait(self, interval: float = 0.5) -> set[str]:
+        while True:
+            time.sleep(interval)
+            mtimes = self.scan()
+            changed = {path for path in mtimes.keys() | self.mtimes.keys() if mtimes.get(path) != self.mtimes.get(path)}
+            self.mtimes = mtimes
+            if changed:
+                return {self.moduleOf(path) for path in changed}
+
+# The extracted ModuleData of whole builds, keyed on the cv2 version, a hash of
+# the stubs and MODEL_VERSION. Rendering from a cached model needs neither cv2 nor the stubs.
+class ModelCache:
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def suffixFor(self, stubHash: str) -> str:
+        return f"-m{MODEL_VERSION}-{stubHash[:16]}{'-linked' if typeRenderer.links else ''}.pickle"
+
+    def pathFor(self, version: str, stubHash: str) -> Path:
+        return self.directory / (version + self.suffixFor(stubHash))
+
+    # The cv2 version of the newest model matching the stubs
+    def newestVersion(self, stubHash: str) -> str:
+        suffix = self.suffixFor(stubHash)
+        paths = sorted(self.directory.glob(f"*{suffix}"), key=lambda path: path.stat().st_mtime)
+        if not paths:
+            return None
+        return paths[-1].name.removesuffix(suffix)
+
+    def load(self, stubHash: str, version: str) -> list[ModuleData]:
+        path = self.pathFor(version, stubHash)
+        if not path.exists():
+            return None
+        return loadPickle(path)
+
+    def save(self, version: str, stubHash: str, modules: list[ModuleData]):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.pathFor(version, stubHash), "wb") as file:
+            pickle.dump(modules, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+# The extracted model in SQLite tables, for tools that look things up in the API
+# instead of reading the pages, e.g. every function taking a MatLike:
+#   SELECT DISTINCT functions.name FROM params JOIN signatures ON signatures.id = params.signatureId
+#     JOIN functions ON functions.id = signatures.functionId WHERE params.type = 'cv2.typing.MatLike'
+# or every deprecated API:
+#   SELECT COALESCE(functions.name, classes.name) FROM notes LEFT JOIN signatures ON signatures.id = notes.signatureId
+#     LEFT JOIN functions ON functions.id = signatures.functionId LEFT JOIN classes ON classes.id = notes.classId
+#     WHERE notes.type = 'deprecated'
+# The first signature of a function has position 0, its overloads follow. The
+# positions keep every list in order, so the pages can be rendered from it again.
+class ApiDatabase:
+    SCHEMA = """
+        PRAGMA journal_mode = OFF;
+        PRAGMA synchronous = OFF;
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE modules (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE, doc TEXT, documentsAttributes INTEGER NOT NULL);
+        CREATE TABLE classes (id INTEGER PRIMARY KEY, moduleId INTEGER NOT NULL REFERENCES modules, position INTEGER NOT NULL,
+                              name TEXT NOT NULL, unqualifiedName TEXT NOT NULL, brief TEXT, docstringSignature TEXT, description TEXT);
+        -- section is functions for the functions of a module, else the list of the class the method is in
+        CREATE TABLE functions (id INTEGER PRIMARY KEY, moduleId INTEGER REFERENCES modules, classId INTEGER REFERENCES classes,
+                                section TEXT NOT NULL, position INTEGER NOT NULL, name TEXT NOT NULL, unqualifiedName TEXT NOT NULL);
+        CREATE TABLE signatures (id INTEGER PRIMARY KEY, functionId INTEGER NOT NULL REFERENCES functions, position INTEGER NOT NULL,
+                                 type TEXT NOT NULL, docstringSignature TEXT, astSignature TEXT, brief TEXT, description TEXT,
+                                 returnDescription TEXT, returnType TEXT);
+        CREATE TABLE params (signatureId INTEGER NOT NULL REFERENCES signatures, position INTEGER NOT NULL,
+                             name TEXT NOT NULL, brief TEXT, type TEXT);
+        -- Notes belong to either a signature or a class
+        CREATE TABLE notes (signatureId INTEGER REFERENCES signatures, classId INTEGER REFERENCES classes, position INTEGER NOT NULL,
+                            type TEXT NOT NULL, note TEXT);
+        CREATE TABLE attributes (moduleId INTEGER REFERENCES modules, classId INTEGER REFERENCES classes, position INTEGER NOT NULL,
+                                 name TEXT, unqualifiedName TEXT, brief TEXT, type TEXT, value TEXT);
+    """
+    # Created after the rows are inserted, which is quicker than updating them per row
+    INDEXES = """
+        CREATE INDEX classesByName ON classes (name);
+        CREATE INDEX functionsByName ON functions (name);
+        CREATE INDEX functionsByUnqualifiedName ON functions (unqualifiedName);
+        CREATE INDEX signaturesByFunction ON signatures (functionId, position);
+        CREATE INDEX signaturesByReturnType ON signatures (returnType);
+        CREATE INDEX paramsBySignature ON params (signatureId, position);
+        CREATE INDEX paramsByType ON params (type);
+        CREATE INDEX notesBySignature ON notes (signatureId);
+        CREATE INDEX notesByClass ON notes (classId);
+        CREATE INDEX notesByType ON notes (type);
+        CREATE INDEX attributesByType ON attributes (type);
+    """
+    CLASS_SECTIONS = ("classMethods", "instanceMethods", "staticMethods")
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def rowsOf(self, model: list[ModuleData]) -> dict[str, list[tuple]]:
+        rows = {table: [] for table in ["modules", "classes", "functions", "signatures", "params", "notes", "attributes"]}
+
+        def addNotes(notes: list[NoteData], signatureId: int, classId: int):
+            rows["notes"].extend((signatureId, classId, position, note.type, note.note) for position, note in enumerate(notes))
+
+        def addAttributes(attributes: list[AttributeData], moduleId: int, classId: int):
+            rows["attributes"].extend((moduleId, classId, position, data.name, data.unqualifiedName, data.brief, data.type, data.value)
+                                      for position, data in enumerate(attributes))
+
+        def addFunction(data: FunctionData, moduleId: int, classId: int, section: str, position: int):
+            functionId = len(rows["functions"]) + 1
+            rows["functions"].append((functionId, moduleId, classId, section, position, data.name, data.unqualifiedName))
+            for signaturePosition, signature in enumerate(data.signatures):
+                signatureId = len(rows["signatures"]) + 1
+                rows["signatures"].append((signatureId, functionId, signaturePosition, signature.type.name, signature.docstringSignature,
+                                           signature.astSignature, signature.brief, signature.description,
+                                           signature.returnDescription, signature.returnType))
+                rows["params"].extend((signatureId, paramPosition, param.name, param.brief, param.type)
+                                      for paramPosition, param in enumerate(signature.params.values()))
+                addNotes(signature.notes, signatureId, None)
+
+        for moduleData in model:
+            moduleId = len(rows["modules"]) + 1
+            rows["modules"].append((moduleId, moduleData.name, moduleData.doc, moduleData.attributes is not None))
+            for position, classData in enumerate(moduleData.classes):
+                classId = len(rows["classes"]) + 1
+                rows["classes"].append((classId, moduleId, position, classData.name, classData.unqualifiedName, classData.brief,
+                                        classData.docstringSignature, classData.description))
+                addNotes(classData.notes, None, classId)
+                for section in self.CLASS_SECTIONS:
+                    for methodPosition, data in enumerate(getattr(classData, section)):
+                        addFunction(data, None, classId, section, methodPosition)
+                addAttributes(classData.instanceAttributes, None, classId)
+            for position, data in enumerate(moduleData.functions):
+                addFunction(data, moduleId, None, "functions", position)
+            addAttributes(moduleData.attributes or [], moduleId, None)
+        return rows
+
+    # Written to a new file in one transaction and then moved over the old one,
+    # so readers never see a half-written database
+    def save(self, model: list[ModuleData], version: str):
+        import sqlite3
+        rows = self.rowsOf(model)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        newPath = self.path.with_name(self.path.name + ".new")
+        newPath.unlink(missing_ok=True)
+        connection = sqlite3.connect(newPath)
+        try:
+            connection.executescript(self.SCHEMA)
+            with connection:
+                connection.execute("INSERT INTO meta VALUES ('version', ?)", (version,))
+                for table, tableRows in rows.items():
+                    if tableRows:
+                        connection.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(tableRows[0]))})", tableRows)
+            connection.executescript(self.INDEXES)
+        finally:
+            connection.close()
+        os.replace(newPath, self.path)
+
+    # The cv2 version and the model saved in the database
+    def load(self) -> tuple[str, list[ModuleData]]:
+        import sqlite3
+        if not self.path.exists():
+            raise FileNotFoundError(f"{self.path} doesn't exist")
+        connection = sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            return self.modelOf(connection)
+        finally:
+            connection.close()
+
+    def modelOf(self, connection) -> tuple[str, list[ModuleData]]:
+        version, = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        signatureNotes: dict[int, list[NoteData]] = {}
+        classNotes: dict[int, list[NoteData]] = {}
+        for signatureId, classId, _, noteType, text in connection.execute("SELECT * FROM notes ORDER BY position"):
+            note = NoteData()
+            note.type = sys.intern(noteType)
+            note.note = text
+            if signatureId is not None:
+                signatureNotes.setdefault(signatureId, []).append(note)
+            else:
+                classNotes.setdefault(classId, []).append(note)
+        signatureParams: dict[int, dict[str, ParamData]] = {}
+        for signatureId, _, name, brief, paramType in connection.execute("SELECT * FROM params ORDER BY signatureId, position"):
+            param = ParamData()
+            param.name = name
+            param.brief = brief
+            param.type = sys.intern(paramType)
+            signatureParams.setdefault(signatureId, {})[name] = param
+        functionNames = {functionId: (name, unqualifiedName)
+                         for functionId, name, unqualifiedName in connection.execute("SELECT id, name, unqualifiedName FROM functions")}
+        functions: dict[int, FunctionData] = {}
+        for (signatureId, functionId, position, functionType, docstringSignature, astSignature, brief, description,
+             returnDescription, returnType) in connection.execute("SELECT * FROM signatures ORDER BY functionId, position"):
+            data = FunctionData()
+            data.name, data.unqualifiedName = functionNames[functionId]
+            data.type = FunctionType[functionType]
+            data.docstringSignature = docstringSignature
+            data.astSignature = astSignature
+            data.brief = brief
+            data.description = description
+            data.returnDescription = returnDescription
+            data.returnType = sys.intern(returnType)
+            data.params = signatureParams.get(signatureId, {})
+            data.notes = signatureNotes.get(signatureId, [])
+            if position == 0:
+                functions[functionId] = data
+            else:
+                functions[functionId].overloads.append(data)
+        moduleAttributes: dict[int, list[AttributeData]] = {}
+        classAttributes: dict[int, list[AttributeData]] = {}
+        for moduleId, classId, _, name, unqualifiedName, brief, attributeType, value in connection.execute(
+                "SELECT * FROM attributes ORDER BY position"):
+            data = AttributeData()
+            data.name = name
+            data.unqualifiedName = unqualifiedName
+            data.brief = brief
+            data.type = sys.intern(attributeType)
+            data.value = value
+            if moduleId is not None:
+                moduleAttributes.setdefault(moduleId, []).append(data)
+            else:
+                classAttributes.setdefault(classId, []).append(data)
+        modules: dict[int, ModuleData] = {}
+        for moduleId, name, doc, documentsAttributes in connection.execute("SELECT * FROM modules ORDER BY id"):
+            moduleData = ModuleData()
+            moduleData.name = name
+            moduleData.doc = doc
+            if documentsAttributes:
+                moduleData.attributes = moduleAttributes.get(moduleId, [])
+            modules[moduleId] = moduleData
+        classes: dict[int, ClassData] = {}
+        for classId, moduleId, _, name, unqualifiedName, brief, docstringSignature, description in connection.execute(
+                "SELECT * FROM classes ORDER BY position"):
+            classData = ClassData()
+            classData.name = name
+            classData.unqualifiedName = unqualifiedName
+            classData.brief = brief
+            classData.docstringSignature = docstringSignature
+            classData.description = description
+            classData.notes = classNotes.get(classId, [])
+            classData.instanceAttributes = classAttributes.get(classId, [])
+            modules[moduleId].classes.append(classData)
+            classes[classId] = classData
+        for functionId, moduleId, classId, section in connection.execute(
+                "SELECT id, moduleId, classId, section FROM functions ORDER BY position"):
+            owner = modules[moduleId] if moduleId is not None else classes[classId]
+            getattr(owner, section).append(functions[functionId])
+        return version, list(modules.values())
+
+# A model saved with --database or --cache-dir
+def loadSnapshot(path: Path) -> list[ModuleData]:
+    with open(path, "rb") as file:
+        isDatabase = file.read(16) == b"SQLite format 3\0"
+    if isDatabase:
+        return ApiDatabase(path).load()[1]
+    model = loadPickle(path)
+    if model is None:
+        raise ValueError(f"{path} was saved by an older version of opencv_doc_parser")
+    return model
+
+# Every documented object of a model by its full name, as (kind, record)
+def apiObjectsOf(model: list[ModuleData]) -> dict[str, tuple[str, Record]]:
+    objects: dict[str, tuple[str, Record]] = dict()
+    for moduleData in model:
+        objects[moduleData.name] = ("module", moduleData)
+        for classData in moduleData.classes:
+            objects[classData.name] = ("class", classData)
+            for data in [*classData.classMethods, *classData.instanceMethods, *classData.staticMethods]:
+                objects[data.name] = ("method", data)
+            for attrdata in classData.instanceAttributes:
+                objects[classData.name + "." + attrdata.unqualifiedName] = ("attribute", attrdata)
+        for data in moduleData.functions:
+            objects[data.name] = ("function", data)
+        for attrdata in moduleData.attributes or []:
+            objects[attrdata.name] = ("attribute", attrdata)
+    return objects
+
+API_DECORATORS = {FunctionType.CLASS_METHOD: "@classmethod ", FunctionType.STATIC_METHOD: "@staticmethod "}
+
+# How a record is called or typed, one line per signature. The docs aren't part
+# of it, so only changes to the API itself are reported.
+def apiSignaturesOf(record: Record) -> list[str]:
+    if isinstance(record, FunctionData):
+        return [API_DECORATORS.get(signature.type, "")
+                + (f"{signature.astSignature} -> {signature.returnType}" if signature.astSignature else signature.docstringSignature)
+                for signature in record.signatures]
+    if isinstance(record, AttributeData):
+        return [record.type + (f" = {record.value}" if record.value else "")]
+    return []
+
+def apiFingerprintOf(record: Record) -> bytes:
+    hasher = hashlib.sha1()
+    if isinstance(record, FunctionData):
+        for signature in record.signatures:
+            hasher.update(repr((signature.type.name, signature.docstringSignature, signature.astSignature, signature.returnType,
+                                [(param.name, param.type) for param in signature.params.values()])).encode())
+    elif isinstance(record, AttributeData):
+        hasher.update(repr((record.type, record.value)).encode())
+    return hasher.digest()
+
+def deprecationOf(record: Record) -> str:
+    if isinstance(record, FunctionData):
+        notes = [note for signature in record.signatures for note in signature.notes]
+    elif isinstance(record, ClassData):
+        notes = record.notes
+    else:
+        return None
+    return next((note.note for note in notes if note.type == "deprecated"), None)
+
+# What changed in the API from one model to another, as lists of objects that
+# were added, removed, changed their signatures or types, or became deprecated
+def diffModels(old: list[ModuleData], new: list[ModuleData]) -> dict[str, list[dict]]:
+    oldObjects = apiObjectsOf(old)
+    newObjects = apiObjectsOf(new)
+    diff = {"added": [], "removed": [], "changed": [], "deprecated": []}
+    for name, (kind, record) in newObjects.items():
+        previous = oldObjects.get(name)
+        if previous is None:
+            diff["added"].append({"name": name, "kind": kind, "signatures": apiSignaturesOf(record)})
+            continue
+        # The fingerprints also cover what the signatures don't show, e.g. docstring
+        # signatures of stubbed functions, which would list no change
+        if apiFingerprintOf(previous[1]) != apiFingerprintOf(record):
+            before = apiSignaturesOf(previous[1])
+            after = apiSignaturesOf(record)
+            if sorted(before) != sorted(after):
+                diff["changed"].append({"name": name, "kind": kind, "before": before, "after": after})
+        note = deprecationOf(record)
+        if note is not None and deprecationOf(previous[1]) is None:
+            diff["deprecated"].append({"name": name, "kind": kind, "note": note})
+    for name, (kind, record) in oldObjects.items():
+        if name not in newObjects:
+            diff["removed"].append({"name": name, "kind": kind, "signatures": apiSignaturesOf(record)})
+    for entries in diff.values():
+        entries.sort(key=lambda entry: entry["name"])
+    return diff
+
+def emitChangelog(diff: dict[str, list[dict]], oldName: str, newName: str) -> Iterator[str]:
+    yield f"# API changes from {oldName} to {newName}\n"
+    for key, title in [("added", "Added"), ("removed", "Removed")]:
+        yield f"\n## {title} ({len(diff[key])})\n"
+        if diff[key]:
+            yield "\n"
+        for entry in diff[key]:
+            yield f"- `{entry['name']}` ({entry['kind']})\n"
+    yield f"\n## Changed signatures ({len(diff['changed'])})\n"
+    for entry in diff["changed"]:
+        yield f"\n### `{entry['name']}` ({entry['kind']})\n\n"
+        for signature in entry["before"]:
+            yield f"- `{signature}`\n" if signature in entry["after"] else f"- removed: `{signature}`\n"
+        for signature in entry["after"]:
+            if signature not in entry["before"]:
+                yield f"- added: `{signature}`\n"
+    yield f"\n## Newly deprecated ({len(diff['deprecated'])})\n"
+    if diff["deprecated"]:
+        yield "\n"
+    for entry in diff["deprecated"]:
+        yield f"- `{entry['name']}` ({entry['kind']}): {entry['note']}\n"
+
+# Leaves files that would not change untouched, so mtime-based rebuilds skip them
+def writeIfChanged(path: Path, text: str, name: str = None) -> bool:
+    return streamIfChanged(path, [text], name)
+
+# Writes fragments to path as they are produced, through a temporary file next to
+# it that shows the partial output while a long build runs, a buffer of a few
+# members at a time. The temporary file only replaces path if its contents
+# differ, and is removed if the build fails. The write is profiled under name,
+# e.g. the module of a shard page, or else the file name.
+def streamIfChanged(path: Path, fragments: Iterable[str], name: str = None) -> bool:
+    partialPath = path.with_name(path.name + ".partial")
+    try:
+        with profiler.stage("write", name or path.stem), open(partialPath, "w") as file:
+            for fragment in fragments:
+                file.write(fragment)
+    except BaseException:
+        partialPath.unlink(missing_ok=True)
+        raise
+    if path.exists() and filecmp.cmp(partialPath, path, shallow=False):
+        partialPath.unlink()
+        return False
+    os.replace(partialPath, path)
+    return True
+
+# Every object that the generated pages define, as an intersphinx inventory
+# and an inverted index for searching names and briefs, so that neither needs
+# a Sphinx build. Objects are added as their pages are written.
+class Inventory:
+    PROJECT = "OpenCV"
+    # Brief words that would match nearly everything
+    STOP_WORDS = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "if", "in", "is", "it", "of", "on",
+                  "or", "the", "this", "to", "with"}
+
+    def __init__(self):
+        self.version: str = ""
+        # (name, role) -> (uri, brief), in the order the pages define them
+        self.objects: dict[tuple[str, str], tuple[str, str]] = dict()
+
+    def addObject(self, name: str, role: str, uri: str, brief: str = ""):
+        self.objects.setdefault((name, role), (uri, brief))
+
+    def addModule(self, moduleName: str, page: str):
+        self.addObject(moduleName, "py:module", f"{page}#module-{moduleName}")
+
+    # Overloads are :noindex:, so only the first signature of a function is a
+    # target. Attributes and classes without a stub are rendered without a name,
+    # so they and their members aren't targets.
+    def addRecord(self, record: Record, page: str):
+        if isinstance(record, FunctionData):
+            self.addObject(record.name, "py:function", f"{page}#{record.name}", record.brief)
+        elif isinstance(record, ClassData) and record.unqualifiedName:
+            self.addObject(record.name, "py:class", f"{page}#{record.name}", record.brief)
+            for method in [*record.classMethods, *record.instanceMethods, *record.staticMethods]:
+                self.addObject(method.name, "py:method", f"{page}#{method.name}", method.brief)
+            for attrdata in record.instanceAttributes:
+                name = f"{record.name}.{attrdata.unqualifiedName}"
+                self.addObject(name, "py:attribute", f"{page}#{name}", attrdata.brief)
+        elif isinstance(record, AttributeData) and record.unqualifiedName:
+            self.addObject(record.name, "py:attribute", f"{page}#{record.name}", record.brief)
+
+    def recorded(self, items: Iterable[tuple[Record, str]], page: str) -> Iterator[tuple[Record, str]]:
+        for record, text in items:
+            self.addRecord(record, page)
+            yield record, text
+
+    # The format Sphinx writes to objects.inv; a uri ending in the name is shortened to $
+    def inventoryBytes(self) -> bytes:
+        header = (f"# Sphinx inventory version 2\n# Project: {self.PROJECT}\n# Version: {self.version}\n"
+                  "# The remainder of this file is compressed using zlib.\n")
+        lines = []
+        for (name, role), (uri, brief) in sorted(self.objects.items()):
+            if uri.endswith("#" + name):
+                uri = uri[:-len(name)] + "$"
+            lines.append(f"{name} {role} {0 if role == 'py:module' else 1} {uri} -\n")
+        return header.encode() + zlib.compress("".join(lines).encode(), 9)
+
+    # Memoized, since watch mode builds an inventory of mostly the same objects every time
+    @staticmethod
+    @functools.cache
+    def nameTerms(name: str) -> frozenset[str]:
+        terms = set()
+        for part in name.split("."):
+            terms.add(part.lower())
+            terms.update(word.lower() for word in re.findall(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+", part))
+        return frozenset(terms)
+
+    @staticmethod
+    @functools.cache
+    def briefTerms(brief: str) -> frozenset[str]:
+        return frozenset(word for word in re.findall(r"[a-z0-9]{2,}", brief.lower()) if word not in Inventory.STOP_WORDS)
+
+    # Objects are [name, role, uri, brief] rows; each term maps to the rows whose
+    # name or brief contains it
+    def searchIndex(self) -> dict:
+        objects = []
+        nameIndex: dict[str, list[int]] = dict()
+        briefIndex: dict[str, list[int]] = dict()
+        for i, ((name, role), (uri, brief)) in enumerate(sorted(self.objects.items())):
+            objects.append([name, role, uri, brief])
+            for term in self.nameTerms(name):
+                nameIndex.setdefault(term, []).append(i)
+            for term in self.briefTerms(brief):
+                briefIndex.setdefault(term, []).append(i)
+        return {
+            "project": self.PROJECT,
+            "version": self.version,
+            "objects": objects,
+            "names": dict(sorted(nameIndex.items())),
+            "briefs": dict(sorted(briefIndex.items())),
+        }
+
+    def write(self, outputDir: Path):
+        inventory = self.inventoryBytes()
+        inventoryPath = outputDir / "objects.inv"
+        if not inventoryPath.exists() or inventoryPath.read_bytes() != inventory:
+            inventoryPath.write_bytes(inventory)
+        writeIfChanged(outputDir / "searchindex.json", json.dumps(self.searchIndex(), separators=(",", ":")))
+
+    def __repr__(self):
+        return f"Inventory({len(self.objects)} objects)"
+
+def writeModule(outputDir: Path, moduleName, doc: str, sections: list[tuple[str, Iterable[tuple[Record, str]]]], shard: bool = False,
+                inventory: Inventory = None):
+    if inventory is not None:
+        inventory.addModule(moduleName, f"{moduleName}.html")
+    if shard:
+        fragments = emitShardedModule(outputDir, moduleName, doc, sections, inventory)
+    else:
+        if inventory is not None:
+            sections = [(title, inventory.recorded(items, f"{moduleName}.html")) for title, items in sections]
+        fragments = emitModule(moduleName, doc, sections)
+    if not streamIfChanged(outputDir / f"{moduleName}.md", fragments):
+        if logLevel >= LL_DEBUG_OVER: print(f"{moduleName}.md is unchanged")
+
+def renderModel(model: list[ModuleData], outputDir: Path, shard: bool = False, inventory: Inventory = None):
+    for moduleData in model:
+        print(f"Rendering {moduleData.name}...")
+        writeModule(outputDir, moduleData.name, moduleData.doc, modelSections(moduleData), shard, inventory)
+
+# The peak resident memory of this process in bytes, or None without the
+# resource module (on Windows)
+def peakRss() -> int:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+# Only Linux has the current RSS without a dependency; elsewhere the peak is
+# the closest there is
+def currentRss() -> int:
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return peakRss()
+
+# Maps through mapper batchSize names at a time, so that a parallel build only
+# has the records of the batch being rendered and of the next one in memory,
+# instead of every module's. Nothing is extracted until the results are used.
+# The next batch is only extracted ahead while the RSS is below memoryLimit.
+# The builtin map is lazy, so serial builds never read ahead.
+class BatchedMapper:
+    def __init__(self, mapper: Callable, batchSize: int, memoryLimit: int = None):
+        self.mapper = mapper
+        self.batchSize = batchSize
+        self.memoryLimit = memoryLimit
+        self.batches: int = 0
+        self.readAheads: int = 0
+
+    def mayReadAhead(self) -> bool:
+        if self.mapper is map:
+            return False
+        if self.memoryLimit is None:
+            return True
+        rss = currentRss()
+        return rss is None or rss < self.memoryLimit
+
+    def __call__(self, function: Callable, names: Iterable[str]) -> Iterator:
+        names = list(names)
+        def results():
+            pending = deque()
+            for start in range(0, len(names), self.batchSize):
+                # Without reading ahead, the previous batch is used up before the next is extracted
+                if pending and not self.mayReadAhead():
+                    yield from pending.popleft()
+                pending.append(self.mapper(function, names[start:start + self.batchSize]))
+                self.batches += 1
+                if len(pending) == 2:
+                    self.readAheads += 1
+                    yield from pending.popleft()
+            while pending:
+                yield from pending.popleft()
+        return results()
+
+    def __repr__(self):
+        return f"BatchedMapper({self.batches} batches of up to {self.batchSize}, {self.readAheads} read ahead)"
+
+# Workers that are spawned rather than forked (the default on macOS and Windows,
+# and forkserver from Python 3.14 on Linux) import this module afresh, so the
+# settings made after importing it are handed to them here
+def initWorker(links: bool, level: int):
+    global logLevel
+    typeRenderer.links = links
+    logLevel = level
+
+# attributeModules are the modules whose attributes are documented; by default
+# all of them but cv2 itself. Without modules, render-only builds render every
+# module of the cached model. shard splits modules into pages, see
+# emitShardedModule. An IncrementalBuild kept across builds can be passed as
+# build, instead of incremental reading it from disk. With a batchSize, members
+# are extracted that many at a time (see BatchedMapper), and the stubs and
+# docstrings of each module are released once it is written. The records kept
+# by incremental builds, the cache and the database aren't bounded by it.
+# Returns the modules that were built.
+def buildModules(modules: list[str], outputDir: Path, jobs: int = 1, incremental: bool = False,
+                 cache: ModelCache = None, renderOnly: bool = False, attributeModules: set[str] = None,
+                 shard: bool = False, inventory: Inventory = None, build: IncrementalBuild = None,
+                 database: ApiDatabase = None, batchSize: int = 0, memoryLimit: int = None) -> list[str]:
+    if attributeModules is None and modules is not None:
+        attributeModules = {moduleName for moduleName in modules if moduleName != "cv2"}
+    if renderOnly and cache is None:
+        version, model = database.load()
+        if inventory is not None:
+            inventory.version = version
+        renderModel(model, outputDir, shard, inventory)
+        return [moduleData.name for moduleData in model]
+    models = None
+    version = None
+    if cache is not None:
+        stubHash = stubHashOf("cv2")
+        version = cache.newestVersion(stubHash) if renderOnly else objectNamed("cv2").__version__
+        if inventory is not None:
+            inventory.version = version or ""
+        model = cache.load(stubHash, version) if version is not None else None
+        if model is not None and (modules is None or [(moduleData.name, moduleData.attributes is not None) for moduleData in model]
+                                  == [(moduleName, moduleName in attributeModules) for moduleName in modules]):
+            renderModel(model, outputDir, shard, inventory)
+            if database is not None:
+                database.save(model, version)
+            return [moduleData.name for moduleData in model]
+        if renderOnly:
+            raise FileNotFoundError(f"{cache.directory} has no cached model of {', '.join(modules or ['cv2'])} for the current stubs")
+    if cache is not None or database is not None:
+        models = []
+    if version is None:
+        version = objectNamed("cv2").__version__
+    if inventory is not None:
+        inventory.version = version
+    if not batchSize:
+        for moduleName in modules:
+            with profiler.stage("stubs", moduleName):
+                stubIndex.indexModule(moduleName)
+            # Incremental builds only parse the docstrings that changed. Parsed
+            # here, before any worker is started, the workers share them.
+            if not incremental and build is None:
+                with profiler.stage("docstring", moduleName):
+                    docstringCache.parseAll(docstringsInModule(moduleName))
+    executor = None
+    mapper = map
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        # Executor.map submits everything as soon as it is called, so every
+        # module's members are queued before the first module is assembled.
+        executor = ProcessPoolExecutor(jobs, initializer=initWorker, initargs=(typeRenderer.links, logLevel))
+        mapper = partial(executor.map, chunksize=PARALLEL_CHUNK_SIZE)
+    if batchSize:
+        mapper = BatchedMapper(mapper, batchSize, memoryLimit)
+    # A build passed in is kept in memory by the caller, which saves it if needed
+    saveBuild = build is None and incremental
+    if build is not None:
+        build.mapper = mapper
+    elif incremental:
+        build = IncrementalBuild(outputDir / MANIFEST_NAME, mapper)
+    try:
+        pending = []
+        for moduleName in modules:
+            moduleData = ModuleData()
+            moduleData.name = moduleName
+            moduleData.doc = objectNamed(moduleName).__doc__
+            if models is not None:
+                models.append(moduleData)
+            pending.append((moduleData, moduleSections(moduleName, moduleName in attributeModules, mapper, build,
+                                                      moduleData if models is not None else None)))
+        for moduleData, sections in pending:
+            print(f"Parsing {moduleData.name}...")
+            writeModule(outputDir, moduleData.name, moduleData.doc, sections, shard, inventory)
+            if batchSize:
+                stubIndex.invalidate([moduleData.name])
+                docstringCache.clear()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    if saveBuild:
+        build.save()
+    if build is not None:
+        if logLevel >= LL_DEBUG_OVER: print(build)
+    if batchSize:
+        if logLevel >= LL_DEBUG_OVER: print(mapper)
+    if cache is not None:
+        cache.save(version, stubHash, models)
+    if database is not None:
+        database.save(models, version)
+    return modules
+
+# print(documentFunctionNamed("cv2.subtract"))
\ No newline at end of file